@@ -1,41 +1,121 @@
+import functools
 import math
 import random
 import re
 from decimal import Decimal
+from typing import Callable
 
 _CONSTANT_COEF_DOT_PATTERN = re.compile(r"(\d+\s*)\\cdot(\s[a-zA-Z])")
-_VARIABLES = ["x", "y", "z"]
+_VARIABLES = ("x", "y", "z")
+_POWER_GLYPHS = _VARIABLES + ("2", "3", "4", "5", "6", "7", "8", "9")
+# variable, unknown and constant terms of generate_variable_isolation
+_ISOLATION_TERMS = ("{}x", "{}y", "{}")
+
+# bound methods of the shared generator save a global and attribute lookup per draw
+_randint = random.randint
+_choice = random.choice
+
+# vertical space left below each problem for the student's work
+_TAIL_11 = r" \\" * 11
+_TAIL_9 = r" \\" * 9
+_TAIL_8 = r" \\" * 8
+
+
+_SYMPY = None
+_VAR_POOL = ()
 
 
 def get_sympy():
-    import sympy
+    """Import sympy on first use, along with the symbols the generators draw variables from."""
+    global _SYMPY, _VAR_POOL
+
+    if _SYMPY is None:
+        import sympy
+
+        _SYMPY = sympy
+        _VAR_POOL = sympy.symbols("a b c x y z m n")
+
+    return _SYMPY
+
+
+@functools.lru_cache(maxsize=2048)
+def _difficulty(freq_weight: int) -> int:
+    """Return the difficulty tier of a problem type; it rises as {freq_weight} decays."""
+    return int(3 - math.log10(freq_weight + 1))
+
+
+def _fast_latex(expr) -> str:
+    """Return sympy.latex(expr) for an integer polynomial in one single-letter variable.
+    Other expressions fall back to sympy's LatexPrinter."""
+    sympy = get_sympy()
+
+    terms = expr.as_ordered_terms() if expr.is_Add else [expr]
+    tex = []
+    for i, term in enumerate(terms):
+        coef, monomial = term.as_coeff_Mul()
+        if not coef.is_Integer:
+            return sympy.latex(expr)
+
+        if monomial is sympy.S.One:
+            body = str(coef if i == 0 else abs(coef))
+        else:
+            if monomial.is_Symbol:
+                base, exp = monomial, 1
+            elif monomial.is_Pow and monomial.base.is_Symbol and monomial.exp.is_Integer:
+                base, exp = monomial.base, monomial.exp
+            else:
+                return sympy.latex(expr)
+
+            if len(base.name) != 1 or exp < 1:
+                return sympy.latex(expr)
 
-    return sympy
+            body = base.name if exp == 1 else f"{base.name}^{{{exp}}}"
+            if abs(coef) != 1:
+                body = f"{abs(coef)} {body}"
+            if i == 0 and coef < 0:
+                body = f"- {body}"
+
+        if i > 0:
+            tex.append(" - " if coef < 0 else " + ")
+        tex.append(body)
+
+    return "".join(tex)
 
 
 def random_factor(
     var, min_coef: int = 1, max_coef: int = 9, min_order: int = 1, max_order: int = 1
 ):
-    return random.randint(min_coef, max_coef) * (var ** random.randint(min_order, max_order))
+    return _randint(min_coef, max_coef) * (var ** _randint(min_order, max_order))
 
 
 # To write a new algebra problem generator you must:
 # * begin the function name with 'generate'
+# * decorate it with @problem_generator
 # * return a 2-tuple of strings ('TeX problem', 'TeX answer')
 # * the last line of the doc string should name the problem type
 
+# mapping of problem function name to generator, in definition order
+PROBLEM_GENERATORS: dict[str, Callable[[int], tuple[str, str]]] = {}
+
+
+def problem_generator(logic: Callable[[int], tuple[str, str]]):
+    """Register {logic} as an algebra problem generator."""
+    PROBLEM_GENERATORS[logic.__name__] = logic
+    return logic
 
+
+@problem_generator
 def generate_integer_factorization(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate integer factorization.
     Problem Description:
     Factorize Integers"""
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
+    difficulty = _difficulty(freq_weight)
 
     primes = [2, 3, 5, 7]
-    sole_factor = random.choice(primes)
+    sole_factor = _choice(primes)
     leftover_primes = set(primes) - {sole_factor}
-    perfect_square = random.choice(list(leftover_primes))
+    perfect_square = _choice(list(leftover_primes))
 
     expression = f"{sole_factor * perfect_square * perfect_square}"
     answer = f"{perfect_square}\\cdot{perfect_square}\\cdot{sole_factor}"
@@ -48,27 +128,28 @@ def generate_integer_factorization(freq_weight: int = 1000) -> tuple[str, str]:
     problem_statement = "Factor the integer into a product of its primes."
 
     return (
-        rf"{problem_statement} \\ \\ \({expression}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression}\){_TAIL_11}",
         rf"\({answer}\)",
     )
 
 
+@problem_generator
 def generate_radical_simplification(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate radical simplification.
     Problem Description:
     Simplify Radicals"""
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
+    difficulty = _difficulty(freq_weight)
 
     primes = [2, 3, 5, 7]
-    sole_factor = random.choice(primes)
+    sole_factor = _choice(primes)
     leftover_primes = set(primes) - {sole_factor}
 
     if difficulty > 2:
         squares = random.choices(population=list(leftover_primes), k=2)
         perfect_square = squares[0] * squares[1]
     else:
-        perfect_square = random.choice(list(leftover_primes))
+        perfect_square = _choice(list(leftover_primes))
 
     expression = f"\\sqrt{{{sole_factor * perfect_square * perfect_square}}}"
     answer = f"{perfect_square}\\sqrt{{{sole_factor}}}"
@@ -76,11 +157,12 @@ def generate_radical_simplification(freq_weight: int = 1000) -> tuple[str, str]:
     problem_statement = "Remove all perfect squares from inside the square root."
 
     return (
-        rf"{problem_statement} \\ \\ \({expression}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression}\){_TAIL_11}",
         rf"\({answer}\)",
     )
 
 
+@problem_generator
 def generate_simple_x_expression(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate an expression in one variable where coefficients and exponents are all integers.
     Problem Description:
@@ -88,8 +170,8 @@ def generate_simple_x_expression(freq_weight: int = 1000) -> tuple[str, str]:
 
     sympy = get_sympy()
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
-    var = random.choice(sympy.symbols("a b c x y z m n"))
+    difficulty = _difficulty(freq_weight)
+    var = _choice(_VAR_POOL)
     problem = "Simplify the following expression."
 
     def fac():
@@ -99,18 +181,20 @@ def generate_simple_x_expression(freq_weight: int = 1000) -> tuple[str, str]:
     if difficulty > 1:
         expression += f" + {fac()} * {fac()} * {fac()}"
 
-    latex_problem = sympy.latex(sympy.sympify(expression, evaluate=False), mul_symbol="dot")
+    parsed = sympy.sympify(expression, evaluate=False)
+    latex_problem = sympy.latex(parsed, mul_symbol="dot")
 
     latex_problem = _CONSTANT_COEF_DOT_PATTERN.sub(r"\1\2", latex_problem)
 
-    solution = sympy.latex(sympy.sympify(expression))
+    solution = _fast_latex(parsed.doit())
 
     return (
-        rf"{problem} \\ \\ \({latex_problem}\) \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem} \\ \\ \({latex_problem}\){_TAIL_8}",
         rf"\({solution}\)",
     )
 
 
+@problem_generator
 def generate_function_evaluation(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate a function in one variable where coefficients and exponents are all integers.
     Problem Description:
@@ -118,12 +202,12 @@ def generate_function_evaluation(freq_weight: int = 1000) -> tuple[str, str]:
 
     sympy = get_sympy()
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
-    var = random.choice(sympy.symbols("a b c x y z m n"))
+    difficulty = _difficulty(freq_weight)
+    var = _choice(_VAR_POOL)
     if difficulty > 1:
-        constant = random_decimal("0.05") + random.randint(0, 4)
+        constant = random_decimal("0.05") + _randint(0, 4)
     else:
-        constant = random.randint(1, 9)
+        constant = _randint(1, 9)
 
     def fac():
         return random_factor(var, max_coef=3 + difficulty, max_order=max(1 + difficulty, 2))
@@ -132,20 +216,33 @@ def generate_function_evaluation(freq_weight: int = 1000) -> tuple[str, str]:
     if difficulty > 1:
         expression += f" + {fac()} * {fac()}"
 
-    latex_expression = sympy.latex(sympy.sympify(expression, evaluate=False), mul_symbol="dot")
+    parsed = sympy.sympify(expression, evaluate=False)
+    latex_expression = sympy.latex(parsed, mul_symbol="dot")
 
     latex_expression = _CONSTANT_COEF_DOT_PATTERN.sub(r"\1\2", latex_expression)
 
-    solution = round(sympy.sympify(expression).evalf(subs={var: constant}))
+    solution = round(parsed.doit().evalf(subs={var: constant}))
 
     prompt = f"Evaluate the following expression with \\({var}\\) = {constant}"
     prompt = f"Evaluate the function.  \\\\ \\begin{{align*}} f({var}) &= {latex_expression} \\\\ f({constant})&=? \\end{{align*}}"
     return (
-        rf"{prompt} \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{prompt}{_TAIL_9}",
         rf"\({solution!s}\)",
     )
 
 
+@functools.cache
+def _linear_equation_template():
+    """Return the placeholders (c, a, b, d, e, v) and both unevaluated sides of c(av + b) = dv + e.
+    Substituting into a prebuilt tree skips the string parser for every new equation."""
+    sympy = get_sympy()
+
+    c, a, b, d, e, v = sympy.symbols("_c _a _b _d _e _v")
+    with sympy.evaluate(False):
+        return (c, a, b, d, e, v), c * (a * v + b), d * v + e
+
+
+@problem_generator
 def generate_simple_x_equation(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate a single variable equation.
     Problem Description:
@@ -153,26 +250,36 @@ def generate_simple_x_equation(freq_weight: int = 1000) -> tuple[str, str]:
 
     sympy = get_sympy()
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
-    var = random.choice(sympy.symbols("a b c x y z m n"))
+    difficulty = _difficulty(freq_weight)
+    var = _choice(_VAR_POOL)
     if difficulty > 1:
-        coef = random_decimal("0.05") + random.randint(-4, 4)
+        coef = random_decimal("0.05") + _randint(-4, 4)
         coef = coef if coef else 1
 
     else:
-        coef = random.randint(-2, 4)
+        coef = _randint(-2, 4)
         coef = coef if coef else 1
 
-    left_string = f"{coef} * ({random.randint(1,4)} * {var} + {random.randint(1,9)})"
-    right_string = f"{random.randint(1,7)} * {var} + {random.randint(1,9)}"
-
-    left_latex = sympy.latex(sympy.sympify(left_string, evaluate=False), mul_symbol="dot")
-    right_latex = sympy.latex(sympy.sympify(right_string, evaluate=False), mul_symbol="dot")
+    (c, a, b, d, e, v), left_template, right_template = _linear_equation_template()
+    values = {
+        c: sympy.sympify(coef),
+        a: sympy.Integer(_randint(1, 4)),
+        b: sympy.Integer(_randint(1, 9)),
+        d: sympy.Integer(_randint(1, 7)),
+        e: sympy.Integer(_randint(1, 9)),
+        v: var,
+    }
+
+    with sympy.evaluate(False):
+        left = left_template.xreplace(values)
+        right = right_template.xreplace(values)
+    left_latex = sympy.latex(left, mul_symbol="dot")
+    right_latex = sympy.latex(right, mul_symbol="dot")
 
     # left_expression = _CONSTANT_COEF_DOT_PATTERN.sub(r"\1\2", left_latex)
     # right_expression = _CONSTANT_COEF_DOT_PATTERN.sub(r"\1\2", right_latex)
 
-    solution = sympy.solve(sympy.Eq(sympy.sympify(left_string), sympy.sympify(right_string)), var)
+    solution = sympy.solve(sympy.Eq(left.doit(), right.doit()), var)
     if solution:
         solution = sympy.latex(solution[0])
         # solution = f"{var} = " + ", ".join(str(round(elem, 2)) for elem in solution)
@@ -182,17 +289,29 @@ def generate_simple_x_equation(freq_weight: int = 1000) -> tuple[str, str]:
     prompt = f"Solve the following equation for \\({var}\\)."
 
     return (
-        rf"{prompt} \\ \\ \({left_latex} = {right_latex}\) \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{prompt} \\ \\ \({left_latex} = {right_latex}\){_TAIL_8}",
         rf"\({solution!s}\)",
     )
 
 
+@functools.cache
+def _decimal_steps(n: str) -> tuple[Decimal, ...]:
+    """Return the value random_decimal(n) yields for each hundredth from 0.01 to 1.00."""
+    # count in integer steps of 'n' and only build a Decimal for each result
+    places = len(n.partition(".")[2])
+    step = int(n.replace(".", ""))
+    target = step * 100 / 10**places
+    return tuple(
+        Decimal(step * round(hundredths / target)).scaleb(-places) for hundredths in range(1, 101)
+    )
+
+
 def random_decimal(n="0.05"):
     """Return a fractional decimal rounded to the nearest 'n'"""
-    target = Decimal(n) * 100
-    return Decimal(target * round(random.randint(1, 100) / target)) / Decimal(100)
+    return _decimal_steps(n)[_randint(1, 100) - 1]
 
 
+@problem_generator
 def generate_decimal_x_equation(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate an equation with decimal coefficients.
     Problem Description:
@@ -200,23 +319,36 @@ def generate_decimal_x_equation(freq_weight: int = 1000) -> tuple[str, str]:
 
     sympy = get_sympy()
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
-    var = random.choice(sympy.symbols("a b c x y z m n"))
+    difficulty = _difficulty(freq_weight)
+    var = _choice(_VAR_POOL)
     if difficulty > 1:
-        denom = random.randint(2, 9)
+        denom = _randint(2, 9)
     else:
-        denom = random.randint(2, 5)
-
-    left_string = f"({random.randint(1, 4)} / {denom}) * ({random.randint(1, 4)} * {var} + {random.randint(-4, 4)})"
-    right_string = f"{random.randint(1, 7)} * {var} + {random.randint(-9, 9)} / {denom}"
-
-    left_latex = sympy.latex(sympy.sympify(left_string, evaluate=False), mul_symbol="dot")
-    right_latex = sympy.latex(sympy.sympify(right_string, evaluate=False), mul_symbol="dot")
+        denom = _randint(2, 5)
+
+    # (a / denom) * (b * var + c) = d * var + e / denom, built as the parser would build it
+    Integer, Mul, Add = sympy.Integer, sympy.Mul, sympy.Add
+    a, b, c, d, e = _randint(1, 4), _randint(1, 4), _randint(-4, 4), _randint(1, 7), _randint(-9, 9)
+    per_denom = sympy.Pow(Integer(denom), Integer(-1), evaluate=False)
+
+    left = Mul(
+        Integer(a),
+        per_denom,
+        Add(Mul(Integer(b), var, evaluate=False), Integer(c), evaluate=False),
+        evaluate=False,
+    )
+    if e < -1:
+        constant = Mul(Integer(-1), Integer(-e), per_denom, evaluate=False)
+    else:
+        constant = Mul(Integer(e), per_denom, evaluate=False)
+    right = Add(Mul(Integer(d), var, evaluate=False), constant, evaluate=False)
+    left_latex = sympy.latex(left, mul_symbol="dot")
+    right_latex = sympy.latex(right, mul_symbol="dot")
 
     # left_expression = _CONSTANT_COEF_DOT_PATTERN.sub(r"\1\2", left_latex)
     # right_expression = _CONSTANT_COEF_DOT_PATTERN.sub(r"\1\2", right_latex)
 
-    solution = sympy.solve(sympy.Eq(sympy.sympify(left_string), sympy.sympify(right_string)), var)
+    solution = sympy.solve(sympy.Eq(left.doit(), right.doit()), var)
     if solution:
         solution = sympy.latex(solution[0])
         # solution = f"{var} = " + ", ".join(str(round(elem, 2)) for elem in solution)
@@ -226,68 +358,60 @@ def generate_decimal_x_equation(freq_weight: int = 1000) -> tuple[str, str]:
     prompt = f"Solve the following equation for \\({var}\\)."
 
     return (
-        rf"{prompt} \\ \\ \(\displaystyle {left_latex} = {right_latex}\) \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{prompt} \\ \\ \(\displaystyle {left_latex} = {right_latex}\){_TAIL_8}",
         rf"\({solution!s}\)",
     )
 
 
+@problem_generator
 def generate_variable_isolation(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate a linear equation with 2 variables.
     Problem Description:
     Isolating Variables in a Linear Equation"""
 
-    # variable = random.choice(["x"])
-    # unknown = random.choice(["y"])
-
-    term_count = random.randint(1, 3)
-    terms = [
-        f"{random.choice([-1,-2,-3,1,2,3])}x",
-        f"{random.choice([-1,-2,-3,1,2,3])}y",
-    ]
-
-    for term in range(term_count):
-        choice = random.choice(["variable", "unknown", "constant"])
-        match choice:
-            case "variable":
-                terms.append(f"{random.choice([-1,-2,-3,1,2,3])}x")
-            case "unknown":
-                terms.append(f"{random.choice([-1,-2,-3,1,2,3])}y")
-            case "constant":
-                terms.append(f"{random.choice([-1,-2,-3,1,2,3])}")
+    # variable = _choice(["x"])
+    # unknown = _choice(["y"])
 
-    left = []
-    right = []
+    term_count = _randint(1, 3)
+    coefs = random.choices((-3, -2, -1, 1, 2, 3), k=term_count + 2)
+    sides = random.choices((0, 1), k=term_count + 2)
+    kinds = random.choices(_ISOLATION_TERMS, k=term_count)
 
-    while terms:
-        if len(terms) == 1:
-            if not left:
-                left.append(terms[0])
-                del terms[0]
-                continue
+    terms = [f"{coefs[0]}x", f"{coefs[1]}y"]
+    terms.extend(kind.format(coef) for kind, coef in zip(kinds, coefs[2:]))
 
-            if not right:
-                right.append(terms[0])
-                del terms[0]
-                continue
+    left = []
+    right = []
 
-        if random.randint(0, 1):
-            left.append(terms[0])
+    for term, side in zip(terms[:-1], sides):
+        if side:
+            left.append(term)
         else:
-            right.append(terms[0])
-        del terms[0]
+            right.append(term)
+
+    # the last term guarantees neither side of the equation is empty
+    if not left:
+        left.append(terms[-1])
+    elif not right:
+        right.append(terms[-1])
+    elif sides[-1]:
+        left.append(terms[-1])
+    else:
+        right.append(terms[-1])
 
-    left = " + ".join(f"{term}" for term in left)
-    right = " + ".join(f"{term}" for term in right)
+    left = " + ".join(left)
+    right = " + ".join(right)
     problem_statement = "Isolate the variable y.  Find the x-intercept and the y-intercept."
 
     expression = f"{left} = {right}"
 
     return (
-        rf"{problem_statement} \\ \\ \({expression}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression}\){_TAIL_11}",
         "Solution here.",
     )
 
 
+@problem_generator
 def generate_system_of_equations(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate a system of equations.
     Problem Description:
@@ -310,8 +434,7 @@ def generate_system_of_equations(freq_weight: int = 1000) -> tuple[str, str]:
         case _:
             solution_set = list(range(-3, 3))
 
-    x_sol = random.choice(solution_set)
-    y_sol = random.choice(solution_set)
+    x_sol, y_sol = random.choices(solution_set, k=2)
 
     a_1, a_2 = random.sample([-3, -2, -1, 1, 2, 3], 2)
     b_1, b_2 = random.sample([-5, -4, -3, -2, -1, 1, 2, 3, 4, 5], 2)
@@ -331,24 +454,25 @@ def generate_system_of_equations(freq_weight: int = 1000) -> tuple[str, str]:
     expression = rf"\begin{{align*}}{left_1} &= {right_1} \\ {left_2} &= {right_2}\end{{align*}}"
 
     return (
-        rf"{problem_statement} \\ \\ {expression} \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ {expression}{_TAIL_11}",
         f"({x_sol}, {y_sol})",
     )
 
 
+@problem_generator
 def generate_arithmetic_sequence(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate an arithmetic sequence.
     Problem Description:
     Arithmetic Sequences"""
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
+    difficulty = _difficulty(freq_weight)
 
-    step = random.choice([-4, -3, -2, 2, 3, 4, 5])
+    step = _choice((-4, -3, -2, 2, 3, 4, 5))
 
-    init = random.randint(-9, 9)
+    init = _randint(-9, 9)
 
     if difficulty > 2:
-        step_delta = random.choice([0.1, 0.2, 0.3, 0.4, 0.5])
+        step_delta = _choice((0.1, 0.2, 0.3, 0.4, 0.5))
         step += step_delta
 
     sequence = ", ".join([str(init + step * count) for count in range(0, 4)])
@@ -357,24 +481,25 @@ def generate_arithmetic_sequence(freq_weight: int = 1000) -> tuple[str, str]:
     problem_statement = "What is the next term in the arithmetic sequence?"
 
     return (
-        rf"{problem_statement} \\ \\ {sequence} \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ {sequence}{_TAIL_11}",
         f"{init+4*step}",
     )
 
 
+@problem_generator
 def generate_arithmetic_sequence_formula(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate an arithmetic sequence formula.
     Problem Description:
     Arithmetic Sequence Formulas"""
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
+    difficulty = _difficulty(freq_weight)
 
-    step = random.choice([-4, -3, -2, 2, 3, 4, 5])
+    step = _choice((-4, -3, -2, 2, 3, 4, 5))
 
-    init = random.randint(-9, 9)
+    init = _randint(-9, 9)
 
     if difficulty > 2:
-        step_delta = random.choice([0.1, 0.2, 0.3, 0.4, 0.5])
+        step_delta = _choice((0.1, 0.2, 0.3, 0.4, 0.5))
         step += step_delta
 
     sequence = ", ".join([str(init + step * count) for count in range(0, 4)])
@@ -385,27 +510,27 @@ def generate_arithmetic_sequence_formula(freq_weight: int = 1000) -> tuple[str,
     )
 
     return (
-        rf"{problem_statement} \\ \\ {sequence} \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ {sequence}{_TAIL_11}",
         f"\\(f[x] = {step} \\cdot x + {init}\\)",
     )
 
 
+@problem_generator
 def generate_geometric_sequence(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate an geometric sequence.
     Problem Description:
     Geometric Sequences"""
 
-    sympy = get_sympy()
+    difficulty = _difficulty(freq_weight)
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
-
-    step = random.choice([2, 3, 4, 5])
-    init = random.choice([-10, -5, -4, -3, -2, -1, 1, 2, 3, 4, 5, 10])
+    step = _choice((2, 3, 4, 5))
+    init = _choice((-10, -5, -4, -3, -2, -1, 1, 2, 3, 4, 5, 10))
 
     sequence = [str(init * step**count) for count in range(0, 5)]
 
     if difficulty > 1:
-        denom_step = random.choice(list({2, 3, 4, 5} - {step}))
+        sympy = get_sympy()
+        denom_step = _choice(list({2, 3, 4, 5} - {step}))
         sequence = [
             sympy.latex(sympy.sympify(f"{init}*({step}/{denom_step})**{count}"))
             for count in range(0, 5)
@@ -423,24 +548,23 @@ def generate_geometric_sequence(freq_weight: int = 1000) -> tuple[str, str]:
     problem_statement = "What is the next term in the geometric sequence?"
 
     return (
-        rf"{problem_statement} \\ \\ \({sequence}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({sequence}\){_TAIL_11}",
         rf"\({answer}\)",
     )
 
 
+@problem_generator
 def generate_geometric_sequence_evaluation(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate geometric sequence formula evaluation.
     Problem Description:
     Evaluate Geometric Sequence Formula"""
 
-    sympy = get_sympy()
-
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
+    difficulty = _difficulty(freq_weight)
 
-    step = random.choice([2, 3, 4, 5])
-    init = random.choice([-10, -5, -4, -3, -2, -1, 1, 2, 3, 4, 5, 10])
+    step = _choice((2, 3, 4, 5))
+    init = _choice((-10, -5, -4, -3, -2, -1, 1, 2, 3, 4, 5, 10))
 
-    n = random.randint(1, 5)
+    n = _randint(1, 5)
     match n:
         case 1:
             evaluate_at = "1st"
@@ -455,18 +579,20 @@ def generate_geometric_sequence_evaluation(freq_weight: int = 1000) -> tuple[str
     answer = init * step ** (n - 1)
 
     if difficulty > 2:
-        denom_step = random.choice(list({2, 3, 4, 5} - {step}))
+        sympy = get_sympy()
+        denom_step = _choice(list({2, 3, 4, 5} - {step}))
         formula = f"f(n)={init} \\cdot (\\frac{{{step}}}{{{denom_step}}})^{{n-1}}"
         answer = sympy.sympify(f"{init} * ({step} / {denom_step}) ** {n-1}")
 
     problem_statement = f"What is the {evaluate_at} term in the sequence?"
 
     return (
-        rf"{problem_statement} \\ \\ \({formula}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({formula}\){_TAIL_11}",
         rf"\({answer}\)",
     )
 
 
+@problem_generator
 def generate_power_expression(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate power evaluation.
     Problem Description:
@@ -474,10 +600,11 @@ def generate_power_expression(freq_weight: int = 1000) -> tuple[str, str]:
 
     global _VARIABLES
 
-    operation = random.choice(["multiply", "divide"])
-    glyph = random.choice(_VARIABLES + ["2", "3", "4", "5", "6", "7", "8", "9"])
-    exponent_1 = random.choice(["-7", "-6", "-5", "-4", "-3", "-2", "2", "3", "4", "5", "6", "7"])
-    exponent_2 = random.choice(["-7", "-6", "-5", "-4", "-3", "-2", "2", "3", "4", "5", "6", "7"])
+    operation = _choice(("multiply", "divide"))
+    glyph = _choice(_POWER_GLYPHS)
+    exponent_1, exponent_2 = random.choices(
+        ("-7", "-6", "-5", "-4", "-3", "-2", "2", "3", "4", "5", "6", "7"), k=2
+    )
 
     if operation == "multiply":
         expression = f"({glyph}^{{{exponent_1}}})({glyph}^{{{exponent_2}}})"
@@ -489,11 +616,12 @@ def generate_power_expression(freq_weight: int = 1000) -> tuple[str, str]:
     problem_statement = f"Rewrite the expression in the form of \\({glyph}^n\\)."
 
     return (
-        rf"{problem_statement} \\ \\ \({expression}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression}\){_TAIL_11}",
         rf"\({answer}\)",
     )
 
 
+@problem_generator
 def generate_radical_simplification_with_vars(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate variable radical simplification.
     Problem Description:
@@ -501,17 +629,15 @@ def generate_radical_simplification_with_vars(freq_weight: int = 1000) -> tuple[
 
     global _VARIABLES
 
-    sympy = get_sympy()
-
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
+    difficulty = _difficulty(freq_weight)
 
     primes = [2, 3, 5, 7]
-    sole_factor = random.choice(primes)
+    sole_factor = _choice(primes)
     leftover_primes = set(primes) - {sole_factor}
-    glyph = random.choice(_VARIABLES)
-    glyph_power = random.choice(range(1, 8))
+    glyph = _choice(_VARIABLES)
+    glyph_power = _choice(range(1, 8))
 
-    perfect_square = random.choice(list(leftover_primes))
+    perfect_square = _choice(list(leftover_primes))
 
     perfect_part = glyph_power // 2
     radical_part = glyph_power % 2
@@ -531,34 +657,40 @@ def generate_radical_simplification_with_vars(freq_weight: int = 1000) -> tuple[
     answer = f"{perfect_square}{glyph if perfect_part else ''}^{{{perfect_part}}}\\sqrt{{{sole_factor}{glyph if radical_part else ''}^{{{radical_part}}}}}"
 
     if difficulty > 2:
-        glyph_power = random.choice(range(1, 8))
-        expression_1 = (
-            f"sqrt({sole_factor * perfect_square * perfect_square} * {glyph} ** {glyph_power})"
-        )
-
-        latex_1 = sympy.latex(sympy.sympify(expression_1, evaluate=False))
+        sympy = get_sympy()
+        # the problem states the variable is positive, so the radicals simplify directly
+        glyph_symbol = sympy.Symbol(glyph, positive=True)
+        glyph_power = _choice(range(1, 8))
+        radicand_1 = sole_factor * perfect_square * perfect_square
 
-        sole_factor_2 = random.choice(primes)
+        sole_factor_2 = _choice(primes)
         leftover_primes_2 = set(primes) - {sole_factor_2}
-        glyph_power_2 = random.choice(range(1, 8))
-        perfect_square_2 = random.choice(list(leftover_primes_2))
+        glyph_power_2 = _choice(range(1, 8))
+        perfect_square_2 = _choice(list(leftover_primes_2))
+        radicand_2 = sole_factor_2 * perfect_square_2 * perfect_square_2
 
-        expression_2 = f"sqrt({sole_factor_2 * perfect_square_2 * perfect_square_2} * {glyph} ** {glyph_power_2})"
-        latex_2 = sympy.latex(sympy.sympify(expression_2, evaluate=False))
-        expression = f"{latex_1} {latex_2}"
-        simplified_expr, val = sympy.posify(sympy.sympify(f"{expression_1} * {expression_2}"))
-        answer = sympy.latex(simplified_expr.subs(val))
+        with sympy.evaluate(False):
+            radical_1 = sympy.sqrt(
+                sympy.Mul(sympy.Integer(radicand_1), sympy.Pow(glyph_symbol, glyph_power))
+            )
+            radical_2 = sympy.sqrt(
+                sympy.Mul(sympy.Integer(radicand_2), sympy.Pow(glyph_symbol, glyph_power_2))
+            )
+
+        expression = f"{sympy.latex(radical_1)} {sympy.latex(radical_2)}"
+        answer = sympy.latex(radical_1.doit() * radical_2.doit())
 
     problem_statement = (
         f"Remove all perfect squares from inside the square root.  Assume {glyph} is positive."
     )
 
     return (
-        rf"{problem_statement} \\ \\ \({expression}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression}\){_TAIL_11}",
         rf"\({answer}\)",
     )
 
 
+@problem_generator
 def generate_binomial_product_expansion(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate binomial product expansion.
     Problem Description:
@@ -568,45 +700,44 @@ def generate_binomial_product_expansion(freq_weight: int = 1000) -> tuple[str, s
 
     sympy = get_sympy()
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
-
-    glyph = random.choice(_VARIABLES)
-    constant_1 = random.choice(["-6", "-5", "-4", "-3", "-2", "-1", "1", "2", "3", "4", "5", "6"])
-    constant_2 = random.choice(["-6", "-5", "-4", "-3", "-2", "-1", "1", "2", "3", "4", "5", "6"])
-    coef_1 = random.choice(["-5", "-4", "-3", "-2", "2", "3", "4", "5"])
-    coef_2 = random.choice(["-5", "-4", "-3", "-2", "2", "3", "4", "5"])
-
-    match difficulty:
-        case difficulty if difficulty <= 1:
-            expression = f"({glyph} + {constant_1})*({glyph} + {constant_2})"
-        case difficulty if difficulty == 2:
-            expression = f"({coef_1}*{glyph} + {constant_1}) * ({glyph} + {constant_2})"
-        case difficulty if difficulty > 3:
-            left_1 = f"{coef_1}*{glyph}"
-            right_1 = constant_1
-            if random.random() > 0.5:
-                left_1, right_1 = right_1, left_1
-
-            left_2 = f"{coef_2}*{glyph}"
-            right_2 = constant_2
-            if random.random() > 0.5:
-                left_2, right_2 = right_2, left_2
-
-            expression = f"({left_1} + {right_1}) * ({left_2} + {right_2})"
-        case _:
-            expression = f"({glyph} + {constant_1})*({glyph} + {constant_2})"
+    difficulty = _difficulty(freq_weight)
+
+    glyph = _choice(_VARIABLES)
+    constant_1, constant_2 = random.choices(
+        ("-6", "-5", "-4", "-3", "-2", "-1", "1", "2", "3", "4", "5", "6"), k=2
+    )
+    coef_1, coef_2 = random.choices(("-5", "-4", "-3", "-2", "2", "3", "4", "5"), k=2)
+
+    if difficulty <= 1:
+        expression = f"({glyph} + {constant_1})*({glyph} + {constant_2})"
+    elif difficulty == 2:
+        expression = f"({coef_1}*{glyph} + {constant_1}) * ({glyph} + {constant_2})"
+    else:
+        left_1 = f"{coef_1}*{glyph}"
+        right_1 = constant_1
+        if random.random() > 0.5:
+            left_1, right_1 = right_1, left_1
+
+        left_2 = f"{coef_2}*{glyph}"
+        right_2 = constant_2
+        if random.random() > 0.5:
+            left_2, right_2 = right_2, left_2
+
+        expression = f"({left_1} + {right_1}) * ({left_2} + {right_2})"
 
-    expression_latex = sympy.latex(sympy.sympify(expression, evaluate=False))
-    answer_latex = sympy.latex(sympy.expand(expression))
+    parsed = sympy.sympify(expression, evaluate=False)
+    expression_latex = sympy.latex(parsed)
+    answer_latex = _fast_latex(sympy.expand(parsed))
 
     problem_statement = f"Expand the binomial product into a standard form polynomial. (Standard form looks like \\(ax^2 + bx + c\\))."
 
     return (
-        rf"{problem_statement} \\ \\ \({expression_latex}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression_latex}\){_TAIL_11}",
         rf"\({answer_latex}\)",
     )
 
 
+@problem_generator
 def generate_multiply_difference_of_squares(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate multiply difference of squares binomial.
     Problem Description:
@@ -616,31 +747,30 @@ def generate_multiply_difference_of_squares(freq_weight: int = 1000) -> tuple[st
 
     sympy = get_sympy()
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
+    difficulty = _difficulty(freq_weight)
 
-    glyph = random.choice(_VARIABLES)
-    constant = random.choice(["1", "2", "3", "4", "5", "6", "7", "8", "9"])
-    coef = random.choice(["2", "3", "4", "5"])
+    glyph = _choice(_VARIABLES)
+    constant = _choice(("1", "2", "3", "4", "5", "6", "7", "8", "9"))
+    coef = _choice(("2", "3", "4", "5"))
 
-    match difficulty:
-        case difficulty if difficulty <= 2:
-            expression = f"({glyph} + {constant})*({glyph} - {constant})"
-        case difficulty if difficulty > 2:
-            expression = f"({coef}*{glyph} + {constant}) * ({coef}*{glyph} - {constant})"
-        case _:
-            expression = f"({glyph} + {constant})*({glyph} - {constant})"
+    if difficulty <= 2:
+        expression = f"({glyph} + {constant})*({glyph} - {constant})"
+    else:
+        expression = f"({coef}*{glyph} + {constant}) * ({coef}*{glyph} - {constant})"
 
-    expression_latex = sympy.latex(sympy.sympify(expression, evaluate=False))
-    answer_latex = sympy.latex(sympy.expand(expression))
+    parsed = sympy.sympify(expression, evaluate=False)
+    expression_latex = sympy.latex(parsed)
+    answer_latex = _fast_latex(sympy.expand(parsed))
 
     problem_statement = f"Expand the binomial product into a standard form polynomial. (Standard form looks like \\(ax^2 + bx + c\\))."
 
     return (
-        rf"{problem_statement} \\ \\ \({expression_latex}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression_latex}\){_TAIL_11}",
         rf"\({answer_latex}\)",
     )
 
 
+@problem_generator
 def generate_multiply_squares_of_binomials(freq_weight: int = 1000) -> tuple[str, str]:
     """Generate multiply squares of binomials.
     Problem Description:
@@ -650,35 +780,33 @@ def generate_multiply_squares_of_binomials(freq_weight: int = 1000) -> tuple[str
 
     sympy = get_sympy()
 
-    difficulty = int(3 - math.log(freq_weight + 1, 10))
-
-    glyph = random.choice(_VARIABLES)
-    constant = random.choice(["1", "2", "3", "4", "5", "6", "7", "8", "9"])
-    coef = random.choice(["2", "3", "4", "5"])
-
-    match difficulty:
-        case difficulty if difficulty <= 1:
-            expression = f"({glyph} + {constant})**2"
-        case difficulty if difficulty == 2:
-            expression = f"({coef}*{glyph} + {constant})**2"
-        case difficulty if difficulty > 2:
-            left = f"{coef}*{glyph}"
-            right = constant
-            if random.random() > 0.5:
-                left, right = right, left
-
-            expression = f"({left} + {right})**2"
-            if random.random() > 0.5:
-                expression.replace("+", "-")
-        case _:
-            expression = f"({glyph} + {constant})*({glyph} - {constant})"
+    difficulty = _difficulty(freq_weight)
+
+    glyph = _choice(_VARIABLES)
+    constant = _choice(("1", "2", "3", "4", "5", "6", "7", "8", "9"))
+    coef = _choice(("2", "3", "4", "5"))
+
+    if difficulty <= 1:
+        expression = f"({glyph} + {constant})**2"
+    elif difficulty == 2:
+        expression = f"({coef}*{glyph} + {constant})**2"
+    else:
+        left = f"{coef}*{glyph}"
+        right = constant
+        if random.random() > 0.5:
+            left, right = right, left
+
+        expression = f"({left} + {right})**2"
+        if random.random() > 0.5:
+            expression = expression.replace("+", "-")
 
-    expression_latex = sympy.latex(sympy.sympify(expression, evaluate=False))
-    answer_latex = sympy.latex(sympy.expand(expression))
+    parsed = sympy.sympify(expression, evaluate=False)
+    expression_latex = sympy.latex(parsed)
+    answer_latex = _fast_latex(sympy.expand(parsed))
 
     problem_statement = f"Expand the binomial product into a standard form polynomial.  (Standard form looks like \\(ax^2 + bx + c\\))."
 
     return (
-        rf"{problem_statement} \\ \\ \({expression_latex}\) \\ \\ \\ \\ \\ \\ \\ \\ \\ \\ \\",
+        rf"{problem_statement} \\ \\ \({expression_latex}\){_TAIL_11}",
         rf"\({answer_latex}\)",
     )
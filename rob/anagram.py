@@ -1,14 +1,46 @@
+import functools
 import itertools
 import pathlib
-import re
+import pickle
+import string
 
+import appdirs
 import typer
 
 _THIS_FILE = pathlib.Path(__file__)
-fp = open(_THIS_FILE.parent / "data" / "word_list.txt")
-_WORDS = fp.readlines()
-_WORDS = "".join(_WORDS)
-fp.close()
+_WORD_FILE = _THIS_FILE.parent / "data" / "word_list.txt"
+_CACHE_FILE = pathlib.Path(appdirs.user_cache_dir()) / "robolson" / "anagram" / "word_list.pickle"
+
+
+@functools.cache
+def load_signatures() -> dict[str, list[str]]:
+    """Return a mapping of sorted letters to every word spelled with exactly those letters.
+    The mapping is pickled to the user cache and rebuilt whenever the word list is newer."""
+
+    try:
+        if _CACHE_FILE.stat().st_mtime >= _WORD_FILE.stat().st_mtime:
+            with open(_CACHE_FILE, "rb") as fp:
+                return pickle.load(fp)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        # a missing, truncated or unreadable cache is simply rebuilt
+        pass
+
+    signatures: dict[str, list[str]] = {}
+    with open(_WORD_FILE) as fp:
+        for line in fp:
+            entry = line.strip()
+            if entry:
+                signatures.setdefault("".join(sorted(entry)), []).append(entry)
+
+    try:
+        _CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(_CACHE_FILE, "wb") as fp:
+            pickle.dump(signatures, fp, protocol=5)
+    except OSError:
+        pass
+
+    return signatures
+
 
 app = typer.Typer()
 
@@ -17,16 +49,13 @@ app = typer.Typer()
 def anagram(word: str, wilds: int = typer.Argument(default=0)) -> list[str]:
     """Return all English anagrams of the input word."""
 
+    words_by_sig = load_signatures()
     letters = list(word)
-    n = len(word)
-
-    perms = set(itertools.permutations(letters + wilds * ["[a-z]"], n + wilds))
-
-    perms = r"\b|\b".join("".join(elem) for elem in perms)
-    perms = rf"\b{perms}\b"
-    patt_1 = re.compile(perms)
 
-    result = set(patt_1.findall(_WORDS))
+    # each wildcard may be any letter, so look up every multiset of fill letters
+    result = set()
+    for fill in itertools.combinations_with_replacement(string.ascii_lowercase, wilds):
+        result.update(words_by_sig.get("".join(sorted(letters + list(fill))), ()))
 
     print("\n".join(elem for elem in result))
 
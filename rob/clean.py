@@ -4,20 +4,24 @@
 # pylint: disable=line-too-long
 
 import datetime
+import errno
+import itertools
+import json
+import math
 import os
 import re
-import shelve
 import shutil
-import statistics
 import sys
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 import appdirs
 import rich
 
 # import rich.traceback
-import toml
+import toml  # only for writing; reading uses the stdlib parser
 import typer
 from click import option
 from typer import Argument, Option
@@ -49,28 +53,40 @@ _PROMPT_STYLE = "[white on blue]"
 _ERROR_STYLE = "[red on black]"
 
 _USER_CONFIG_FILE = Path(appdirs.user_config_dir()) / "robolson" / "clean" / "config" / "clean.toml"
-_UNDO_FILE = Path(appdirs.user_data_dir()) / "robolson" / "clean" / "data" / "undo.db"
+_UNDO_FILE = Path(appdirs.user_data_dir()) / "robolson" / "clean" / "data" / "undo.json"
+_LEGACY_UNDO_FILE = Path(appdirs.user_data_dir()) / "robolson" / "clean" / "data" / "undo.db"
 _LOG_FILE = Path(appdirs.user_data_dir()) / "robolson" / "clean" / "data" / "system_calls.log"
 _LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 _LOG_FILE.touch(exist_ok=True)
 
 _BLACKLIST_FILE = Path(appdirs.user_data_dir()) / "robolson" / "clean" / "data" / "ignore.db"
 
-if not _UNDO_FILE.exists():
-    os.makedirs(_UNDO_FILE.parent, exist_ok=True)
-    db = shelve.open(str(_UNDO_FILE))
-    db.close()
+
+def _replace_file(path: Path, contents: str) -> None:
+    """Write contents to path through a temporary file, so a crash never leaves it half-written."""
+
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as fp:
+        fp.write(contents)
+    os.replace(temp_path, path)
+
+
+def _save_settings() -> None:
+    """Write the current settings to the user config file."""
+
+    _replace_file(_USER_CONFIG_FILE, toml.dumps(_SETTINGS))
+
 
 _BASE_CONFIG_FILE = _THIS_FILE.parent / "config" / "clean.toml"
-with open(_BASE_CONFIG_FILE, "r") as fp:
-    _SETTINGS = toml.load(fp)
+with open(_BASE_CONFIG_FILE, "rb") as fp:
+    _SETTINGS = tomllib.load(fp)
 
 if _USER_CONFIG_FILE.exists():
-    with open(_USER_CONFIG_FILE, "r") as fp:
+    with open(_USER_CONFIG_FILE, "rb") as fp:
         try:
-            USER_SETTINGS = toml.load(fp)
+            USER_SETTINGS = tomllib.load(fp)
             _SETTINGS.update(USER_SETTINGS)
-        except toml.decoder.TomlDecodeError:
+        except tomllib.TOMLDecodeError:
             rich.print(
                 "[yellow]WARNING.[/yellow] Config file corrupted (invalid TOML file).  Using default settings."
             )
@@ -78,9 +94,7 @@ if _USER_CONFIG_FILE.exists():
 
 else:
     _USER_CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    _USER_CONFIG_FILE.touch(exist_ok=True)
-    with open(_USER_CONFIG_FILE, "w") as fp:
-        toml.dump(_SETTINGS, fp)
+    _save_settings()
 
 
 _CROWDED_FOLDER = _SETTINGS["CROWDED_FOLDER"]  # number of files that is 'crowded'
@@ -88,22 +102,41 @@ _FILE_TYPES: dict[str, list[str]] = _SETTINGS[
     "FILE_TYPES"
 ]  # dictionary of (folder, file-types) pairs
 ARCHIVE_FOLDERS = list(_FILE_TYPES.keys())
-_EXTENSIONS = [extensions for extensions in _FILE_TYPES.values()]
-_EXTENSIONS = [item for sublist in _EXTENSIONS for item in sublist]
-_EXCLUSIONS = _SETTINGS["EXCLUSIONS"]  # list of files to totally ignore
+_ARCHIVE_FOLDER_PATHS = tuple(Path(folder) for folder in ARCHIVE_FOLDERS)
+# folders that hold archives rather than files to archive
+_ARCHIVE_FOLDER_NAMES = frozenset(ARCHIVE_FOLDERS) | {"misc"}
+# every archived extension (case-folded), for the per-file "is this a file?" checks
+_EXTENSIONS = frozenset(item.casefold() for sublist in _FILE_TYPES.values() for item in sublist)
+# names of files to totally ignore, case-folded for case-insensitive file systems
+_EXCLUSIONS = frozenset(name.casefold() for name in _SETTINGS["EXCLUSIONS"])
 MONTHS = _SETTINGS["MONTHS"]  # strings to use when writing names of months
 MONTHS.insert(0, None)
+# "3 (March)" part of a month folder name, indexed by month number
+_MONTH_SUFFIXES = [None] + [f"{month} ({MONTHS[month]})" for month in range(1, 13)]
 ARCHIVE_HOME = _SETTINGS["ARCHIVE_HOME"]
 
+# directory reads overlapped when scanning archives; bounded to keep open folder handles in check
+_SCAN_WORKERS = 16
+# file renames issued at once when archiving
+_MOVE_WORKERS = 16
+
+_YEAR_SUFFIX = re.compile(r" [0-9][0-9][0-9][0-9]")
+_UNCROWDED_PATTERN = re.compile(r"\w+ \d\d? \(\w+\) \d\d\d\d")
+# large file thresholds typed at the prompt, e.g. "200mb", "1_500 kbs" or "1,000"
+_MEGABYTES_PATTERN = re.compile(r"(\d[\d_,]*)\s*mbs?", re.IGNORECASE)
+_KILOBYTES_PATTERN = re.compile(r"(\d[\d_,]*)\s*kbs?", re.IGNORECASE)
+_INTEGER_PATTERN = re.compile(r"\d[\d_,]*$")
+
 # _COMMANDS = []
 
 
 def generate_extension_handler(file_types: dict[str, list[str]]) -> dict[str, str]:
-    """Returns a dictionary that associates extension keys with their assigned file type / folder name."""
+    """Returns a dictionary that associates extension keys with their assigned file type / folder name.
+    Keys are case-folded, so look them up with a case-folded suffix."""
     extension_handler: dict[str, str] = {}
     for file_type in file_types.keys():
         for extension in file_types[file_type]:
-            extension_handler[extension] = file_type
+            extension_handler[extension.casefold()] = file_type
 
     return extension_handler
 
@@ -117,33 +150,46 @@ def isolate_crowded_folders(
     """Return a list of directories with many files inside.
     post: True"""
 
-    crowded = []
+    folders = [folder for folder in folders if not folder.is_file()]
+    if not folders:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(_SCAN_WORKERS, len(folders))) as executor:
+        crowding = executor.map(_is_crowded, folders, itertools.repeat(crowded_threshold))
+        return [folder for folder, crowded in zip(folders, crowding) if crowded]
 
-    for folder in folders:
-        if folder.is_file():
-            continue
 
-        if len(list(folder.glob("*.*"))) > crowded_threshold:
-            crowded.append(folder)
+def _is_crowded(folder: Path, crowded_threshold: int) -> bool:
+    """Return True if folder holds more than crowded_threshold entries with an extension."""
 
-    return crowded
+    count = 0
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if "." in entry.name:
+                count += 1
+                # the rest of the folder need not be read once the threshold is passed
+                if count > crowded_threshold:
+                    return True
+
+    return False
 
 
 def uncrowd_folder(folder: Path, yes_all: bool = False) -> dict[Path, Path]:
     """Return a dictionary that associates crowded files in a folder with a better Path."""
 
-    files = folder.glob("*.*")
+    file_stats = gather_file_stats(folder)
     file_targets: dict[Path, Path] = {}
-    for file in files:
-        last_modified = datetime.datetime.fromtimestamp(os.path.getmtime(file.absolute()))
-
-        f_month = MONTHS[last_modified.month]
-        f_year = last_modified.year
-
-        target_folder = (
-            Path(f"{file.parent}")
-            / f"{file.parent.parent.name} {last_modified.month} ({f_month}) {f_year}"
-        )
+    file_type_folder = folder.parent.name
+    # files from the same month share a folder, so each is named once
+    month_folders: dict[tuple[int, int], Path] = {}
+    for file, stat in file_stats.items():
+        last_modified = datetime.datetime.fromtimestamp(stat.st_mtime)
+
+        month = (last_modified.year, last_modified.month)
+        target_folder = month_folders.get(month)
+        if target_folder is None:
+            target_folder = folder / f"{file_type_folder} {_MONTH_SUFFIXES[month[1]]} {month[0]}"
+            month_folders[month] = target_folder
 
         file_targets[file] = target_folder / file.name
 
@@ -157,73 +203,152 @@ def uncrowd_folder(folder: Path, yes_all: bool = False) -> dict[Path, Path]:
         # )
 
 
+def _has_uncrowded_children(target_folder: Path) -> bool:
+    """Return True if target folder has month sub-folders left by a previous uncrowding."""
+
+    try:
+        with os.scandir(target_folder) as entries:
+            return any(_UNCROWDED_PATTERN.match(entry.name) and entry.is_dir() for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
 def associate_files(
-    files: list[Path],
+    files: Iterable[Path],
     # root: Path = Path("."),
     root: Path = ARCHIVE_HOME,
     extension_handler: dict[str, str] | None = None,
     default_folder: Path = Path("misc"),
     yes_all: bool = True,
+    file_stats: dict[Path, os.stat_result] | None = None,
 ) -> dict[Path, Path]:
-    """Returns a dictionary that associates passed files with their most organized location."""
+    """Returns a dictionary that associates passed files with their most organized location.
+    Modification times are taken from file_stats when the caller already has them."""
 
     if not extension_handler:
         extension_handler = {}
 
+    if not file_stats:
+        file_stats = {}
+
     # os.chdir(root.absolute())
 
     file_targets: dict[Path, Path] = {}
 
-    uncrowded_pattern = re.compile(r"\w+ \d\d? \(\w+\) \d\d\d\d")
+    default_folder_name = default_folder.name
+
+    # many files share a target folder, so each folder is only built and listed once per call
+    year_folders: dict[tuple[str, int], Path] = {}
+    month_folders: dict[tuple[Path, int], Path] = {}
+    uncrowded: dict[Path, bool] = {}
 
     for file in files:
         # ignore registered archive folders
-        if file.name in _FILE_TYPES.keys() or file.name == "misc":
+        if file.name in _ARCHIVE_FOLDER_NAMES:
             continue
 
         # ignore folders if no user interaction
         if not file.suffix and yes_all:
             continue
 
-        last_modified = datetime.datetime.fromtimestamp(os.path.getmtime(file))
-        file_type_folder = extension_handler.get(file.suffix, default_folder.name)
-
-        f_year: str = str(last_modified.year)
-        f_month: str = str(last_modified.month)
-        target_folder = root / Path(f"{file_type_folder}") / f"{file_type_folder} {f_year}"
+        stat = file_stats.get(file)
+        mtime = stat.st_mtime if stat else os.path.getmtime(file)
+        last_modified = datetime.datetime.fromtimestamp(mtime)
+        file_type_folder = extension_handler.get(file.suffix.casefold(), default_folder_name)
 
-        sub_folders = [folder for folder in target_folder.glob("*") if folder.is_dir()]
+        year = last_modified.year
+        target_folder = year_folders.get((file_type_folder, year))
+        if target_folder is None:
+            target_folder = Path(root) / file_type_folder / f"{file_type_folder} {year}"
+            year_folders[(file_type_folder, year)] = target_folder
+            uncrowded[target_folder] = _has_uncrowded_children(target_folder)
 
         # if target folder has sub-folders from previous uncrowding, follow the uncrowded naming protocol
-        if any(uncrowded_pattern.match(folder.name) for folder in sub_folders):
-            target_folder = (
-                target_folder / f"{file_type_folder} {last_modified.month} ({f_month}) {f_year}"
-            )
+        if uncrowded[target_folder]:
+            month = (target_folder, last_modified.month)
+            target_folder = month_folders.get(month)
+            if target_folder is None:
+                target_folder = month[0] / f"{file_type_folder} {_MONTH_SUFFIXES[month[1]]} {year}"
+                month_folders[month] = target_folder
 
         file_targets[file] = target_folder / file.name
 
     return file_targets
 
 
-def remove_empty_dir(path: str | Path):
-    """Remove empty folder."""
+def remove_empty_dir(path: str | Path) -> bool:
+    """Remove empty folder.  Return True if it was removed."""
 
     try:
         os.rmdir(path)
         print(f"Removing empty folder ({path}).")
+        return True
     except OSError:
-        pass
+        return False
+
+
+def _remove_empty_subdirs(path: str) -> bool:
+    """Remove the empty folders beneath path, deepest first.  Return True if path is left empty."""
+
+    try:
+        with os.scandir(path) as entries:
+            children = 0
+            sub_folders = []
+            for entry in entries:
+                children += 1
+                if entry.is_dir(follow_symlinks=False):
+                    sub_folders.append(entry.path)
+    except OSError:
+        return False
+
+    for sub_folder in sub_folders:
+        if _remove_empty_subdirs(sub_folder) and remove_empty_dir(sub_folder):
+            children -= 1
+
+    return children == 0
 
 
 @archive_app.command(name="empty")
 def remove_empty_dirs(target: Path = Path(".")):
-    """Recursively remove empty folders."""
+    """Recursively remove empty folders beneath target.  Target itself is kept."""
+
+    # only folders known to be empty are handed to rmdir
+    _remove_empty_subdirs(os.path.abspath(target))
+
+
+def load_undo_log() -> dict[str, dict[str, str]]:
+    """Return the recorded moves of each cleaned folder, keyed by its lowercase path."""
+
+    try:
+        with open(_UNDO_FILE, "r", encoding="utf-8") as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError:
+        rich.print(
+            "[yellow]WARNING.[/yellow] Undo file corrupted (invalid JSON file).  Starting afresh."
+        )
+        return {}
+
+    # carry over the moves recorded by the shelve-based undo file of earlier versions
+    import dbm
+    import shelve
+
+    undo_log: dict[str, dict[str, str]] = {}
+    try:
+        with shelve.open(str(_LEGACY_UNDO_FILE), flag="r") as db:
+            for key in db.keys():
+                undo_log[key] = {str(source): str(dest) for source, dest in db[key].items()}
+    except dbm.error:
+        pass
+
+    return undo_log
+
 
-    for trunk, dirnames, _ in os.walk(target, topdown=False):
-        for dirname in dirnames:
-            remove_empty_dir(os.path.realpath(os.path.join(trunk, dirname)))
+def save_undo_log(undo_log: dict[str, dict[str, str]]) -> None:
+    """Write the recorded moves of every cleaned folder to the undo file."""
 
-    remove_empty_dir(target)
+    _replace_file(_UNDO_FILE, json.dumps(undo_log))
 
 
 @main_app.command()
@@ -241,18 +366,21 @@ def undo(
     """Undo file manipulations in target directory."""
 
     undo_commands = {}
+    target_root = target.absolute()
+    undo_key = str(target_root).lower()
 
-    with shelve.open(str(_UNDO_FILE)) as db:
-        try:
-            old_commands = db[str(target.absolute()).lower()]
-            for source, dest in old_commands.items():
-                undo_commands[dest] = target.absolute() / source
-                # undo_commands.append((command, dest, source))
-                # _COMMANDS.append((command, dest, source))
-
-        except KeyError:
-            rich.print(f"[red]No recorded commands executed on ({Path(target).absolute()}).")
-            exit(1)
+    # the undo file is read once and written once for the whole command
+    undo_log = load_undo_log()
+    try:
+        old_commands = undo_log[undo_key]
+        for source, dest in old_commands.items():
+            undo_commands[Path(dest)] = target_root / source
+            # undo_commands.append((command, dest, source))
+            # _COMMANDS.append((command, dest, source))
+
+    except KeyError:
+        rich.print(f"[red]No recorded commands executed on ({Path(target).absolute()}).")
+        exit(1)
 
     preview_mvs(undo_commands, absolute=True)
 
@@ -267,17 +395,15 @@ def undo(
 
     if choice in ["y", "yes", "Y", "YES"]:
         try:
-            execute_move_commands(undo_commands)
+            execute_move_commands(undo_commands, undo_log=undo_log)
 
         except Exception as e:
-            with shelve.open(str(_UNDO_FILE)) as db:
-                del db[str(target.absolute()).lower()]
+            del undo_log[undo_key]
+            save_undo_log(undo_log)
             print(e)
             exit(1)
-        with shelve.open(str(_UNDO_FILE)) as db:
-            db[str(target.absolute()).lower()] = undo_commands
-
-            # pickle.dump(_COMMANDS, _UNDO_FILE)
+        undo_log[undo_key] = {str(source): str(dest) for source, dest in undo_commands.items()}
+        save_undo_log(undo_log)
 
     remove_empty_dirs(target)
 
@@ -290,59 +416,105 @@ def undo(
 def preview_mvs(renames: dict[Path, Path], absolute: bool = False) -> Callable:
     """Print a list of mv targets.
     post: True"""
+    # joining onto the working directory matches Path.absolute() without a getcwd per path
+    cwd = Path.cwd()
     for source, dest in renames.items():
-        if source.suffix in _EXTENSIONS:
-            rich.print(
-                f"mv [green]{source.absolute() if absolute else source.name} [red]{dest.absolute()}"
-            )
+        if source.suffix.casefold() in _EXTENSIONS:
+            rich.print(f"mv [green]{cwd / source if absolute else source.name} [red]{cwd / dest}")
 
 
-def execute_move_commands(commands: dict[Path, Path], target: Path = Path("."), yes_all=False):
-    """Execute a sequence of file move commands."""
+def _move_file(source: Path, dest: Path) -> None:
+    """Move a file, renaming it in place unless dest is on another filesystem."""
+    try:
+        os.replace(source, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source, dest)
+
+
+def execute_move_commands(
+    commands: dict[Path, Path],
+    target: Path = Path("."),
+    yes_all=False,
+    undo_log: dict[str, dict[str, str]] | None = None,
+):
+    """Execute a sequence of file move commands.
+    The commands are recorded in undo_log, or straight to the undo file if none is given."""
     sources = list(commands.keys())
     one_file = target.is_file()
+    cwd = Path.cwd()
+
+    # many files share a destination, so each folder is created once up front
+    dest_folders = {
+        dest.parent for source, dest in commands.items() if source.suffix.casefold() in _EXTENSIONS
+    }
+    for folder in dest_folders:
+        os.makedirs(folder, exist_ok=True)
+
+    file_sources = []
     for source in sources:
-        if source.suffix not in _EXTENSIONS:  # if source is a folder, rather than a file
-            if yes_all:  # ignore folders if no user interaction
-                continue
+        if source.suffix.casefold() in _EXTENSIONS:
+            file_sources.append(source)
+            continue
 
-            print(f"Move '{source.absolute()}' to which folder?")
+        # source is a folder, rather than a file
+        if yes_all:  # ignore folders if no user interaction
+            continue
 
-            candidate = query.select(ARCHIVE_FOLDERS)
+        print(f"Move '{cwd / source}' to which folder?")
 
-            file_type_folder = Path(candidate)
+        candidate = query.select(ARCHIVE_FOLDERS)
 
-            target_folder = associate_files(
-                files=[source],
-                extension_handler={"": str(file_type_folder)},
-                default_folder=file_type_folder,
-            )
-            os.makedirs(target_folder[source].parent.absolute(), exist_ok=True)
-            shutil.move(source.absolute(), target_folder[source].absolute())
-            # today = datetime.datetime.today().isoformat(timespec="minutes")
-            today = datetime.datetime.today().ctime()
+        file_type_folder = Path(candidate)
 
-            with open(_LOG_FILE, "a", encoding="utf-8") as fp:
-                fp.write(f"{today}\nmv {source.absolute()} {target_folder[source].absolute()}\n")
-            continue
+        target_folder = associate_files(
+            files=[source],
+            extension_handler={"": str(file_type_folder)},
+            default_folder=file_type_folder,
+            yes_all=False,
+        )
+        os.makedirs(target_folder[source].parent, exist_ok=True)
+        shutil.move(os.fspath(source), os.fspath(target_folder[source]))
+        # today = datetime.datetime.today().isoformat(timespec="minutes")
+        today = datetime.datetime.today().ctime()
+
+        with open(_LOG_FILE, "a", encoding="utf-8") as fp:
+            fp.write(f"{today}\nmv {cwd / source} {cwd / target_folder[source]}\n")
+
+    # renames are independent and release the GIL, so they are issued concurrently;
+    # results are reported and logged afterwards, in order, from this thread
+    with ThreadPoolExecutor(max_workers=_MOVE_WORKERS) as executor:
+        moves = {
+            source: executor.submit(_move_file, source, commands[source]) for source in file_sources
+        }
+
+    moved = []
+    for source, move in moves.items():
         try:
-            os.makedirs(commands[source].parent.absolute(), exist_ok=True)
-            shutil.move(source.absolute(), commands[source].absolute())
-            today = datetime.datetime.today().ctime()
+            move.result()
+            moved.append(source)
 
-            with open(_LOG_FILE, "a", encoding="utf-8") as fp:
-                fp.write(f"{today}\nmv {source.absolute()} {commands[source].absolute()}\n")
-
-        # File of Same Name Has Already Been Moved To Folderg
-        except shutil.Error as e:
-            print(e)
         except FileNotFoundError:
-            rich.print(f"{_ERROR_STYLE}{source.absolute()} not found.")
-    with shelve.open(str(_UNDO_FILE)) as db:
-        if one_file:
-            db[str(target.parent.absolute()).lower()] = commands
-        else:
-            db[str(target.absolute()).lower()] = commands
+            rich.print(f"{_ERROR_STYLE}{cwd / source} not found.")
+        # File of Same Name Has Already Been Moved To Folderg, or the move was refused;
+        # the other moves have already happened, so they must still be logged below
+        except OSError as e:
+            print(e)
+
+    if moved:
+        today = datetime.datetime.today().ctime()
+        with open(_LOG_FILE, "a", encoding="utf-8") as fp:
+            for source in moved:
+                fp.write(f"{today}\nmv {cwd / source} {cwd / commands[source]}\n")
+    undo_key = str(cwd / (target.parent if one_file else target)).lower()
+    recorded = {str(source): str(dest) for source, dest in commands.items()}
+    if undo_log is None:
+        undo_log = load_undo_log()
+        undo_log[undo_key] = recorded
+        save_undo_log(undo_log)
+    else:
+        undo_log[undo_key] = recorded
 
 
 def create_config():
@@ -354,6 +526,42 @@ def create_config():
     print(f"User config file created at:\n{_USER_CONFIG_FILE}")
 
 
+def _scan_files(
+    target: str | Path,
+    extensions: list[str] | None,
+    recurse: bool,
+    recursion_limit: int | None,
+    exclusions: list[str] | None,
+) -> Iterator[os.DirEntry]:
+    """Yield the directory entries of files in target directory (see gather_files)."""
+
+    # None means no limit; 0 keeps to target itself, as does recurse=False
+    depth_limit = recursion_limit if recurse else 0
+    if extensions:
+        extensions = frozenset(extension.casefold() for extension in extensions)
+
+    # scandir entries carry their file type from the directory read, so no entry needs a stat
+    stack = [(os.fspath(target), 0)]
+    while stack:
+        folder, depth = stack.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if depth_limit is None or depth < depth_limit:
+                        stack.append((entry.path, depth + 1))
+                    continue
+
+                _, dot, extension = entry.name.rpartition(".")
+                if not dot:
+                    continue
+                if extensions and (dot + extension).casefold() not in extensions:
+                    continue
+                if exclusions and entry.name in exclusions:
+                    continue
+
+                yield entry
+
+
 def gather_files(
     target: str | Path = Path("."),
     extensions: list[str] | None = None,
@@ -361,31 +569,54 @@ def gather_files(
     recursion_limit: int | None = None,
     exclusions: list[str] | None = None,
 ) -> list[Path]:
-    """Return a list of files in target directory, optionally filtered by file extension(s) and exclusions."""
-    glob_query: str = ""
-
-    match (recurse, recursion_limit):
-        case (True, None):
-            glob_query = "**/." if recurse else "*."
-        case (True, x) if x > 0:
-            glob_query = "*/" * x + "*."
-        case _:
-            glob_query = "*."
+    """Return a list of files in target directory, optionally filtered by file extension(s) and exclusions.
+    With recurse, files up to recursion_limit folders deep are included (all depths if None)."""
 
-    if extensions:
-        glob_query += "".join({f"[{extension}]" for extension in extensions})
-    else:
-        glob_query += "*"
+    return [
+        Path(entry.path)
+        for entry in _scan_files(target, extensions, recurse, recursion_limit, exclusions)
+    ]
+
+
+def gather_file_stats(
+    target: str | Path = Path("."),
+    extensions: list[str] | None = None,
+    recurse: bool = False,
+    recursion_limit: int | None = None,
+    exclusions: list[str] | None = None,
+) -> dict[Path, os.stat_result]:
+    """Like gather_files, but map each file to its stat result so callers never stat it again."""
 
-    all_files = Path(target).glob(glob_query)
+    return {
+        Path(entry.path): entry.stat()
+        for entry in _scan_files(target, extensions, recurse, recursion_limit, exclusions)
+    }
 
-    if all_files and exclusions:
-        all_files = [Path(file) for file in all_files if file.name not in exclusions]
 
-    if all_files:
-        return list(all_files)
+def _iter_folder(target: Path) -> Iterator[Path]:
+    """Yield every entry (files and folders alike) directly inside target."""
 
-    return []
+    with os.scandir(target) as entries:
+        for entry in entries:
+            yield Path(entry.path)
+
+
+def _year_folders(folder: Path) -> list[Path]:
+    """Return the yearly archive folders (e.g. 'media 2023') inside an archive folder."""
+
+    # case-folded, like the extension and exclusion checks, for case-insensitive file systems
+    archive_name = folder.name.casefold()
+    try:
+        with os.scandir(folder) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if (name := entry.name.casefold()).startswith(archive_name)
+                and _YEAR_SUFFIX.fullmatch(name, len(archive_name))
+                and entry.is_dir()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
 
 
 @main_app.command(name="files")
@@ -398,21 +629,31 @@ def clean_files(
 ) -> None:
     """Clean the files by extension in target root directory."""
     extension_handler = _EXTENSION_HANDLER
+    file_stats: dict[Path, os.stat_result] = {}
 
+    # files are streamed into associate_files rather than copied into intermediate lists
+    root_files: Iterable[Path]
     if target.is_file():
         root_files = [target]
     else:
         if recurse:
-            root_files = target.rglob("*.*")
+            file_stats = gather_file_stats(target, recurse=True)
+            root_files = iter(file_stats)
         else:
-            # root_files = target.glob("*.*")
-            root_files = target.glob("*")
+            # folders are offered too, so this is a plain listing rather than gather_files
+            root_files = _iter_folder(target)
 
         if exclusions:
-            root_files = [file for file in root_files if file not in exclusions]
+            if isinstance(exclusions, (str, Path)):
+                exclusions = [exclusions]
+            excluded = frozenset(Path(name).name.casefold() for name in exclusions)
+            root_files = (file for file in root_files if file.name.casefold() not in excluded)
 
     target_mvs: dict[Path, Path] = associate_files(
-        files=list(root_files), extension_handler=extension_handler, yes_all=yes_all
+        files=root_files,
+        extension_handler=extension_handler,
+        yes_all=yes_all,
+        file_stats=file_stats,
     )
 
     if yes_all:
@@ -421,7 +662,7 @@ def clean_files(
 
         def repr_func(key, value):
             global _EXTENSIONS
-            if key.suffix in _EXTENSIONS:
+            if key.suffix.casefold() in _EXTENSIONS:
                 return f"{key} [white] -> [/white]{value}"
             else:
                 return f"{key}"
@@ -434,6 +675,29 @@ def clean_files(
         execute_move_commands(approved_mvs, target=target, yes_all=yes_all)
 
 
+def _parse_large_threshold(choice: str) -> int:
+    """Return the size in bytes above which a file is large, from the answer typed at the prompt."""
+
+    match choice:
+        case ("y" | "Y" | "yes"):
+            return 150_000_000
+        case ("n" | "N" | "no"):
+            return 150_000_000_000_000_000
+        case x if size := _MEGABYTES_PATTERN.match(x):
+            return _strip_separators(size.group(1)) * 1_000_000
+        case x if size := _KILOBYTES_PATTERN.match(x):
+            return _strip_separators(size.group(1)) * 1000
+        case x if _INTEGER_PATTERN.match(x):
+            return _strip_separators(x) * 1_000_000
+        case _:
+            return 150_000_000_000_000_000
+
+
+def _strip_separators(digits: str) -> int:
+    """Return the integer written by digits, ignoring "_" and "," separators."""
+    return int(digits.replace("_", "").replace(",", ""))
+
+
 @archive_app.command(name="large")
 def identify_large_files(
     target: Path = Argument(Path("."), help="Target folder to locate overly large files."),
@@ -443,23 +707,28 @@ def identify_large_files(
 
     archive_folders = [Path(target) / f"{archive_folder}" for archive_folder in _FILE_TYPES.keys()]
     sub_folders = []
-    all_files = []
+    file_stats: dict[Path, os.stat_result] = {}
 
     for folder in archive_folders:
-        sub_folders.extend(list(folder.glob(f"{folder.name} [0-9][0-9][0-9][0-9]/")))
+        sub_folders.extend(_year_folders(folder))
 
     for sub_folder in sub_folders:
-        all_files.extend(sub_folder.rglob("*.*"))
+        file_stats.update(gather_file_stats(sub_folder, recurse=True))
 
     # all_files = gather_files(target=target, recurse=True, recursion_limit=3)
-    if not all_files:
+    if not file_stats:
         rich.print("No archives found.")
         return
 
-    file_sizes = [os.stat(file.absolute()).st_size for file in all_files]
-    avg_file_size = sum(file_sizes) / len(file_sizes)
+    import statistics
+
+    file_sizes = [stat.st_size for stat in file_stats.values()]
+    avg_file_size = statistics.fmean(file_sizes)
     if len(file_sizes) > 1:
-        standard_deviation = statistics.stdev(file_sizes)
+        # sample deviation in floats; statistics.stdev works in exact fractions
+        standard_deviation = math.sqrt(
+            math.fsum([(size - avg_file_size) ** 2 for size in file_sizes]) / (len(file_sizes) - 1)
+        )
     else:
         standard_deviation = 0
 
@@ -471,32 +740,15 @@ def identify_large_files(
         )
         choice = input(f"{_PROMPT}")
 
-    large: int = 0
-
-    match choice:
-        case ("y" | "Y" | "yes"):
-            large = 150_000_000
-        case ("n" | "N" | "no"):
-            large = 150_000_000_000_000_000
-        case x if re.match(r"\d+mbs?", x, re.IGNORECASE):
-            large = int(re.match(r"([\d_]+) ?mbs?", x, re.IGNORECASE).group(1))
-            large = large * 1_000_000
-        case x if re.match(r"\d+kbs?", x, re.IGNORECASE):
-            large = int(re.match(r"([\d_]+) ?kbs?", x, re.IGNORECASE).group(1))
-            large = large * 1000
-        case x if re.match(r"\d+$", x):
-            large = int(x) * 1_000_000
-        case _:
-            large = 150_000_000_000_000_000
-
-    large_files = [file for file in all_files if os.stat(file.absolute()).st_size > large]
+    large = _parse_large_threshold(choice)
+    large_files = [file for file, stat in file_stats.items() if stat.st_size > large]
 
     if yes_all:
         approved_files = large_files
     else:
 
         def show_file_size(x):
-            return f"{x} ({float(os.stat(x.absolute()).st_size / 1000000):_.2f} Mb)"
+            return f"{x} ({float(file_stats[x].st_size / 1000000):_.2f} Mb)"
 
         rich.print(f"{_PROMPT_STYLE}Select large files to isolate:")
 
@@ -507,7 +759,10 @@ def identify_large_files(
         )
     if approved_files:
         large_mvs = associate_files(
-            approved_files, default_folder=Path("large_files"), yes_all=yes_all
+            approved_files,
+            default_folder=Path("large_files"),
+            yes_all=yes_all,
+            file_stats=file_stats,
         )
 
         execute_move_commands(large_mvs)
@@ -523,10 +778,12 @@ def identify_crowded_archives(
 ) -> None:
     """Archives with file count exceeding threshold is sub-divided by month folders."""
 
-    archive_folders = [Path(f"{key}") for key in _FILE_TYPES.keys()]
+    archive_folders = _ARCHIVE_FOLDER_PATHS
     all_folders = []
-    for folder in archive_folders:
-        all_folders.extend(list(folder.glob(f"{folder} [0-9][0-9][0-9][0-9]/")))
+    # every archive is listed independently, so the reads are overlapped
+    with ThreadPoolExecutor(max_workers=min(_SCAN_WORKERS, len(archive_folders) or 1)) as executor:
+        for year_folders in executor.map(_year_folders, archive_folders):
+            all_folders.extend(year_folders)
 
     crowded_folders = isolate_crowded_folders(all_folders, crowded_threshold=threshold)
 
@@ -593,18 +850,14 @@ def config(ctx: typer.Context):
 def add_archive(new_archive: str) -> None:
     """Add a new archive type."""
     _SETTINGS["FILE_TYPES"][new_archive] = []
-    fp = open(_USER_CONFIG_FILE, "w")
-    toml.dump(_SETTINGS, fp)
-    fp.close()
+    _save_settings()
 
 
 @config_app.command(name="remove")
 def remove_archive(target_archive: str) -> None:
     """Remove an archive type from the list."""
     del _SETTINGS["FILE_TYPES"][target_archive]
-    fp = open(_USER_CONFIG_FILE, "w")
-    toml.dump(_SETTINGS, fp)
-    fp.close()
+    _save_settings()
     print(f"Removed {target_archive} from archive list.")
 
 
@@ -626,8 +879,7 @@ def config_restore() -> None:
     """Restore user config file to default."""
     choice = input(f"Restore user config file to default.  Are you sure? (Y/N)\n{_PROMPT}")
     if choice in ["y", "Y"]:
-        with open(_USER_CONFIG_FILE, "w") as fp:
-            toml.dump(_SETTINGS, fp)
+        _save_settings()
     else:
         exit(0)
 
@@ -705,9 +957,7 @@ def edit_archive(target_archive: str):
 @edit_app.command(name="add")
 def add_extension(target_archive: str, new_extension: str):
     _SETTINGS["FILE_TYPES"][target_archive].append(new_extension)
-    fp = open(_USER_CONFIG_FILE, "w")
-    toml.dump(_SETTINGS, fp)
-    fp.close()
+    _save_settings()
 
     print(f"Added {new_extension} to {target_archive}.")
 
@@ -715,9 +965,7 @@ def add_extension(target_archive: str, new_extension: str):
 @edit_app.command(name="remove")
 def remove_extension(target_archive: str, target_extension: str):
     _SETTINGS["FILE_TYPES"][target_archive].remove(target_extension)
-    fp = open(_USER_CONFIG_FILE, "w")
-    toml.dump(_SETTINGS, fp)
-    fp.close()
+    _save_settings()
 
     print(f"Removed {target_extension} from {target_archive}.")
 
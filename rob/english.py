@@ -104,11 +104,12 @@ _LATEX_FILE = (
 _LATEX_FILE.parent.mkdir(exist_ok=True, parents=True)
 
 if not _LATEX_FILE.exists():
-    _LATEX_FILE.touch()
-    _LATEX_TEMPLATES = toml.loads(open(_LATEX_DEFAULT_FILE.absolute(), "r").read())
-    toml.dump(o=_LATEX_TEMPLATES, f=open(_LATEX_FILE.absolute(), "w"))
+    _LATEX_TEMPLATES = toml.load(_LATEX_DEFAULT_FILE)
+    with open(_LATEX_FILE, "w") as fp:
+        toml.dump(_LATEX_TEMPLATES, fp)
 
-_LATEX_TEMPLATES = toml.loads(open(_LATEX_FILE.absolute(), "r").read())
+else:
+    _LATEX_TEMPLATES = toml.load(_LATEX_FILE)
 
 _LATEX_PAGE_HEADER = _LATEX_TEMPLATES["page_header"]
 _LATEX_DOC_HEADER = _LATEX_TEMPLATES["doc_header"]
@@ -121,11 +122,12 @@ _CONFIG_FILE = (
 _CONFIG_FILE.parent.mkdir(exist_ok=True, parents=True)
 
 if not _CONFIG_FILE.exists():
-    _CONFIG_FILE.touch()
-    _CONFIG = toml.loads(open(_CONFIG_DEFAULT_FILE.absolute(), "r").read())
-    toml.dump(o=_CONFIG, f=open(_CONFIG_FILE.absolute(), "w"))
+    _CONFIG = toml.load(_CONFIG_DEFAULT_FILE)
+    with open(_CONFIG_FILE, "w") as fp:
+        toml.dump(_CONFIG, fp)
 
-_CONFIG = toml.loads(open(_CONFIG_FILE, "r").read())
+else:
+    _CONFIG = toml.load(_CONFIG_FILE)
 
 _WEEKDAYS = _CONFIG["constants"]["weekdays"]
 _MONTHS = _CONFIG["constants"]["months"]
@@ -739,7 +741,8 @@ def config_prompt():
 
     _CONFIG["LLM"]["instruction"] = choice["prompt"]
 
-    toml.dump(o=_CONFIG, f=open(_CONFIG_FILE.absolute(), "w"))
+    with open(_CONFIG_FILE, "w") as fp:
+        toml.dump(_CONFIG, fp)
 
 
 @config_app.command("model")
@@ -765,7 +768,8 @@ def config_model(target=None):
 
     _CONFIG["LLM"]["model"] = models[choice]
 
-    toml.dump(o=_CONFIG, f=open(_CONFIG_FILE.absolute(), "w"))
+    with open(_CONFIG_FILE, "w") as fp:
+        toml.dump(_CONFIG, fp)
 
 
 @config_app.callback(invoke_without_command=True)
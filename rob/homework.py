@@ -1,3 +1,4 @@
+import collections
 import datetime
 import pathlib
 import random
@@ -10,6 +11,7 @@ import toml
 import typer
 
 from .algebra.problems import *  # noqa: F403
+from .algebra.problems import PROBLEM_GENERATORS
 
 _DEBUG = False
 
@@ -33,42 +35,67 @@ if "english" in sys.argv:
     )
 
 
+_DISK_IO_PREPARED = False
+_SAVE_DIRTY = False
+
+
 def prepare_disk_io():
-    start = time.perf_counter()
     global _LATEX_FILE, _SAVE_FILE, _SAVE_DATA, _LATEX_TEMPLATES, _WEEKDAYS, _MONTHS, _VARIABLES, _START
+    global _LATEX_PAGE_PARTS, _DISK_IO_PREPARED, _SAVE_DIRTY
+
+    if _DISK_IO_PREPARED:
+        return
+
+    start = time.perf_counter()
     _THIS_FILE = pathlib.Path(__file__)
 
     _LATEX_FILE = _THIS_FILE.parent / "config" / "algebra" / "latex_templates.toml"
     _LATEX_FILE.parent.mkdir(exist_ok=True)
-    _LATEX_TEMPLATES = toml.loads(open(_LATEX_FILE.absolute(), "r").read())
+    _LATEX_TEMPLATES = toml.loads(_LATEX_FILE.read_text())
+    _LATEX_PAGE_PARTS = _LATEX_TEMPLATES["page_header"].split("INSERT_DATE_HERE")
 
     _SAVE_FILE = pathlib.Path(appdirs.user_data_dir()) / "robolson" / "algebra" / "config.toml"
 
     if not _SAVE_FILE.exists():
         # NEW_SAVE_FILE = pathlib.Path("data/algebra/save.toml")
         NEW_SAVE_FILE = _THIS_FILE.parent / "config" / "algebra" / "config.toml"
-        _SAVE_DATA = toml.loads(open(NEW_SAVE_FILE.absolute(), "r").read())
-        _SAVE_FILE.parent.mkdir(exist_ok=True)
-        # _SAVE_FILE.touch()
-        toml.dump(o=_SAVE_DATA, f=open(_SAVE_FILE.name, "w"))
+        _SAVE_DATA = toml.loads(NEW_SAVE_FILE.read_text())
+        _SAVE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _SAVE_DIRTY = True
+        save_data()
 
     else:
-        _SAVE_DATA = toml.loads(open(_SAVE_FILE.absolute(), "r").read())
+        _SAVE_DATA = toml.loads(_SAVE_FILE.read_text())
 
-    _WEEKDAYS = _SAVE_DATA["constants"]["weekdays"]
-    _MONTHS = _SAVE_DATA["constants"]["months"]
-    _VARIABLES = _SAVE_DATA["constants"]["variables"]
+    _WEEKDAYS = tuple(_SAVE_DATA["constants"]["weekdays"])
+    _MONTHS = tuple(_SAVE_DATA["constants"]["months"])
+    _VARIABLES = tuple(_SAVE_DATA["constants"]["variables"])
 
     _START = datetime.datetime.today()
-    _DAYS = [_START + datetime.timedelta(days=i) for i in range(30)]
-    _DATES = [
-        f"{_WEEKDAYS[day.weekday()]} {_MONTHS[day.month]} {day.day}, {day.year}" for day in _DAYS
-    ]
+    _DISK_IO_PREPARED = True
     stop = time.perf_counter()
     if _DEBUG:
         print(f"File i/o boilerplate executed. ({stop - start: .3f} sec)")
 
 
+def _get_dates(start: datetime.date, count: int) -> list[str]:
+    """Return the assignment dates for {count} days from {start}."""
+    days = [start + datetime.timedelta(days=i) for i in range(count)]
+    return [
+        f"{_WEEKDAYS[day.weekday()]} {_MONTHS[day.month]} {day.day}, {day.year}" for day in days
+    ]
+
+
+def save_data():
+    """Write the save data to disk, but only if it was modified since it was last written."""
+    global _SAVE_DIRTY
+    if not _SAVE_DIRTY:
+        return
+
+    _SAVE_FILE.write_text(toml.dumps(_SAVE_DATA))
+    _SAVE_DIRTY = False
+
+
 class ProblemCategory:
     """Represents a category of algebra problem.
     Must supply the logic for generating a problem statement as a valid function.
@@ -80,7 +107,7 @@ class ProblemCategory:
         self.weight: int = weight
         self.logic = logic
         if logic.__doc__:
-            self.description = logic.__doc__.split("\n")[-1].strip()
+            self.description = logic.__doc__.rsplit("\n", 1)[-1].strip()
         else:
             print(f"Problem generator requires docstring: {logic.__name__}")
             exit(0)
@@ -113,8 +140,7 @@ def list_weights() -> None:
         "--------------------------------\nProblems start with 1000 weight.  \nWeight decreases exponentially with use.  \nProblems with smaller weight are less likely to appear in problem sets.  \nSome problem types will increase with difficulty as their weight decreases.  \n--------------------------------"
     )
 
-    for problem in _PROBLEM_GENERATORS:
-        statement = globals()[problem].__doc__.split("\n")[-1]
+    for problem, statement in _NAME_TO_DESCRIPTION.items():
         print(f"{statement}: {_SAVE_DATA['weights'][problem]}")
 
 
@@ -127,6 +153,7 @@ def render_latex(
     problem_set=None,  # type: ignore Typer
 ) -> None:
     """Return a string coding for {assignment_count} pages of LaTeX algebra problems."""
+    global _SAVE_DIRTY
 
     prepare_globals()
     prepare_disk_io()
@@ -144,71 +171,78 @@ def render_latex(
 
     pages = []
     solutions = []
+    used = collections.Counter()
 
     doc_header = _LATEX_TEMPLATES["doc_header"]
+    dates = _get_dates(_START, assignment_count)
 
     for i in range(assignment_count):
-        solution_set = rf"{_DATES[i]}\\"
-        page_header = _LATEX_TEMPLATES["page_header"]
-        parts = page_header.split("INSERT_DATE_HERE")
-        page_header = _DATES[i].join(parts)
+        solution_set = [rf"{dates[i]}\\"]
+        page_header = dates[i].join(_LATEX_PAGE_PARTS)
 
-        problem_statement = ""
+        problem_statement = []
 
-        problem_generators = random.sample(
+        problem_generators = random.choices(
             problem_set,
+            weights=[problem.weight + problem_count + 1 for problem in problem_set],
             k=problem_count,
-            counts=[problem.weight + problem_count + 1 for problem in problem_set],
         )
 
         problems: list[Problem] = [problem.generate() for problem in problem_generators]
 
         for k, problem in enumerate(problems):
             if k % 3 == 0 and k != 0:
-                problem_statement += r"\newpage"
-
-            problem_statement += problem.problem
-            solution_set += rf"{k+1}: {problem.solution}\;\;"
+                problem_statement.append(r"\newpage")
 
-            # _SAVE_DATA["weights"][problem.name] = int(_SAVE_DATA["weights"][problem.name] * 0.9)
-            _SAVE_DATA["weights"][problem.name] = int(
-                _SAVE_DATA["weights"].get(problem.name, 1000) * 0.9
-            )
+            problem_statement.append(problem.problem)
+            solution_set.append(rf"{k+1}: {problem.solution}\;\;")
+            used[problem.name] += 1
 
         page_footer = r"\end{enumerate}"
-        solutions.append(solution_set)
-        pages.append(page_header + problem_statement + page_footer)
+        solutions.append("".join(solution_set))
+        pages.append(page_header + "".join(problem_statement) + page_footer)
+
+    # each use of a problem type decays its weight by 10%
+    for name, count in used.items():
+        weight = _SAVE_DATA["weights"].get(name, 1000)
+        for _ in range(count):
+            weight = int(weight * 0.9)
+        if _SAVE_DATA["weights"].get(name) != weight:
+            _SAVE_DATA["weights"][name] = weight
+            _SAVE_DIRTY = True
 
     doc_footer = r"\end{document}"
 
-    document = (
-        doc_header + r"\newpage".join(pages) + r"\newpage " + r"\\".join(solutions) + doc_footer
-    )
-
     document_name = f"Algebra Homework {_MONTHS[datetime.datetime.now().month]} {datetime.datetime.now().day} {datetime.datetime.now().year}.tex"
 
     print(f"Writing LaTeX document to '{document_name}")
 
-    fp = open(document_name, "w")
-    fp.write(document)
-    fp.close()
+    with open(document_name, "w", buffering=1 << 16) as fp:
+        fp.write(doc_header)
+        fp.write(r"\newpage".join(pages))
+        fp.write(r"\newpage ")
+        fp.write(r"\\".join(solutions))
+        fp.write(doc_footer)
 
     if not debug:
-        toml.dump(o=_SAVE_DATA, f=open(_SAVE_FILE.absolute(), "w"))
+        save_data()
 
 
 @algebra_app.command("reset")
 def reset_weights(debug: bool = True):
     """Reset problem frequency rates to default."""
+    global _SAVE_DIRTY
 
     prepare_disk_io()
 
     # weights: dict[str, int] = _SAVE_DATA["weights"]
     for key in _SAVE_DATA["weights"].keys():
-        _SAVE_DATA["weights"][key] = 1000
+        if _SAVE_DATA["weights"][key] != 1000:
+            _SAVE_DATA["weights"][key] = 1000
+            _SAVE_DIRTY = True
 
     if not debug:
-        toml.dump(o=_SAVE_DATA, f=open(_SAVE_FILE.absolute(), "w"))
+        save_data()
         print("Frequency weights reset to default (1000).")
     else:
         print("Invoke with --no-debug to save changes.")
@@ -218,6 +252,7 @@ def reset_weights(debug: bool = True):
 @algebra_app.command("config")
 def configure_problem_set():
     """Configures the frequency rates of problems."""
+    global _SAVE_DIRTY
 
     prepare_globals()
 
@@ -234,8 +269,10 @@ def configure_problem_set():
         return
 
     data = {_DESCRIPTION_TO_NAME[desc]: data[desc] for desc in data.keys()}
-    _SAVE_DATA["weights"] = data
-    toml.dump(o=_SAVE_DATA, f=open(_SAVE_FILE.absolute(), "w"))
+    if data != _SAVE_DATA["weights"]:
+        _SAVE_DATA["weights"] = data
+        _SAVE_DIRTY = True
+    save_data()
     print(f"\nNew weights saved to {_SAVE_FILE.absolute()}")
 
 
@@ -276,12 +313,8 @@ def algebra_default(ctx: typer.Context, debug: bool = False):
     if not problem_count:
         problem_count = 4
 
-    days = [start_date + datetime.timedelta(days=i) for i in range(assignment_count + 1)]
-
-    global _DATES
-    _DATES = [
-        f"{_WEEKDAYS[day.weekday()]} {_MONTHS[day.month]} {day.day}, {day.year}" for day in days
-    ]
+    global _START
+    _START = start_date
 
     render_latex(
         assignment_count=assignment_count,
@@ -334,16 +367,15 @@ _DESCRIPTION_TO_NAME = {}
 
 
 def prepare_globals():
-    global _PROBLEM_GENERATORS, _ALL_PROBLEMS, _NAME_TO_DESCRIPTION, _DESCRIPTION_TO_NAME
+    global _PROBLEM_GENERATORS, _ALL_PROBLEMS, _NAME_TO_DESCRIPTION, _DESCRIPTION_TO_NAME, _SAVE_DIRTY
 
     prepare_disk_io()
 
-    _problem_dict = {k: v for k, v in globals().items() if k.startswith("generate") and callable(v)}
-    _PROBLEM_GENERATORS = [k for k in _problem_dict.keys()]
+    _PROBLEM_GENERATORS = list(PROBLEM_GENERATORS)
 
     _ALL_PROBLEMS = [
         ProblemCategory(logic=logic, weight=int(_SAVE_DATA["weights"].get(name, 1000)))
-        for name, logic in _problem_dict.items()
+        for name, logic in PROBLEM_GENERATORS.items()
     ]
 
     for problem in _ALL_PROBLEMS:
@@ -352,27 +384,22 @@ def prepare_globals():
             _SAVE_DATA["weights"][problem.name] = 1000
 
     # mapping of problem function name to problem description
-    _NAME_TO_DESCRIPTION = {
-        name: globals()[name].__doc__.split("\n")[-1].strip() for name in _PROBLEM_GENERATORS
-    }
+    _NAME_TO_DESCRIPTION = {problem.name: problem.description for problem in _ALL_PROBLEMS}
 
     # mapping of problem description to problem function name
-    _DESCRIPTION_TO_NAME = {
-        globals()[name].__doc__.split("\n")[-1].strip(): name for name in _PROBLEM_GENERATORS
-    }
+    _DESCRIPTION_TO_NAME = {problem.description: problem.name for problem in _ALL_PROBLEMS}
 
-    removed_old_generator = False
-    for generator in list(_SAVE_DATA["weights"].keys()):
-        if generator not in globals().keys():
-            del _SAVE_DATA["weights"][generator]
-            removed_old_generator = True
+    old_generators = _SAVE_DATA["weights"].keys() - PROBLEM_GENERATORS.keys()
+    for generator in old_generators:
+        del _SAVE_DATA["weights"][generator]
 
-    if removed_old_generator:
+    if old_generators:
         _SAVE_DATA["constants"]["weekdays"] = _WEEKDAYS
         _SAVE_DATA["constants"]["months"] = _MONTHS
         _SAVE_DATA["constants"]["variables"] = _VARIABLES
 
-        toml.dump(o=_SAVE_DATA, f=open(_SAVE_FILE.absolute(), "w"))
+        _SAVE_DIRTY = True
+        save_data()
 
 
 # _problem_dict = { =_SAVE_DATA, f=open(_SAVE_FILE.absolute(), "w"))
@@ -0,0 +1,32 @@
+import os
+import pickle
+
+import pytest
+
+from .. import anagram
+
+
+@pytest.fixture
+def word_list(tmp_path, monkeypatch):
+    """Point the anagram index at a small word list and a cache file in tmp_path."""
+    word_file = tmp_path / "word_list.txt"
+    word_file.write_text("listen\nsilent\nenlist\ngoogle\n")
+    monkeypatch.setattr(anagram, "_WORD_FILE", word_file)
+    monkeypatch.setattr(anagram, "_CACHE_FILE", tmp_path / "cache" / "word_list.pickle")
+    anagram.load_signatures.cache_clear()
+    yield word_file
+    anagram.load_signatures.cache_clear()
+
+
+def test_load_signatures_rebuilds_truncated_cache(word_list):
+    cache_file = anagram._CACHE_FILE
+    cache_file.parent.mkdir()
+    cache_file.write_bytes(pickle.dumps({"eilnst": ["listen"]}, protocol=5)[:10])
+    # newer than the word list, so the cache would be trusted if it could be read
+    os.utime(cache_file, (word_list.stat().st_mtime + 10,) * 2)
+
+    signatures = anagram.load_signatures()
+
+    assert signatures["eilnst"] == ["listen", "silent", "enlist"]
+    with open(cache_file, "rb") as fp:
+        assert pickle.load(fp) == signatures
@@ -1,8 +1,25 @@
+import errno
+import os
+import shelve
 import sys
 from pathlib import Path
 
 import pytest
 
+from .. import clean
+from ..clean import (
+    _has_uncrowded_children,
+    _move_file,
+    _parse_large_threshold,
+    _replace_file,
+    _year_folders,
+    execute_move_commands,
+    gather_files,
+    load_undo_log,
+    remove_empty_dirs,
+    save_undo_log,
+)
+
 # from click import decorators
 
 # from hypothesis import given, strategies
@@ -17,6 +34,237 @@ def test_nothing():
     pass
 
 
+def test_gather_files(tmp_path):
+    (tmp_path / "nested" / "deeper").mkdir(parents=True)
+    for name in [
+        "a.txt",
+        "b.py",
+        "desktop.ini",
+        "no_extension",
+        "nested/c.txt",
+        "nested/deeper/d.py",
+    ]:
+        (tmp_path / name).touch()
+
+    def names(files):
+        return sorted(file.name for file in files)
+
+    assert names(gather_files(tmp_path)) == ["a.txt", "b.py", "desktop.ini"]
+    assert names(gather_files(tmp_path, extensions=[".txt"], recurse=True)) == ["a.txt", "c.txt"]
+    assert names(gather_files(tmp_path, recurse=True, recursion_limit=0)) == [
+        "a.txt",
+        "b.py",
+        "desktop.ini",
+    ]
+    # the limit is a maximum depth, so shallower files are kept too
+    assert names(gather_files(tmp_path, recurse=True, recursion_limit=1)) == [
+        "a.txt",
+        "b.py",
+        "c.txt",
+        "desktop.ini",
+    ]
+    assert names(gather_files(tmp_path, recurse=True, recursion_limit=2)) == names(
+        gather_files(tmp_path, recurse=True)
+    )
+    assert names(gather_files(tmp_path, recurse=True, exclusions=["desktop.ini"])) == [
+        "a.txt",
+        "b.py",
+        "c.txt",
+        "d.py",
+    ]
+
+
+def test_year_folders(tmp_path):
+    media = tmp_path / "media"
+    for name in ["media 2023", "Media 2024", "media 20245", "misc 2023"]:
+        (media / name).mkdir(parents=True)
+    (media / "media 2022").touch()
+
+    assert sorted(folder.name for folder in _year_folders(media)) == ["Media 2024", "media 2023"]
+    assert _year_folders(tmp_path / "missing") == []
+
+
+def test_has_uncrowded_children(tmp_path):
+    assert not _has_uncrowded_children(tmp_path / "missing")
+
+    (tmp_path / "notes 3 (March) 2023.txt").touch()
+    assert not _has_uncrowded_children(tmp_path)
+
+    (tmp_path / "media 3 (March) 2023").mkdir()
+    assert _has_uncrowded_children(tmp_path)
+
+
+def test_move_file_falls_back_across_filesystems(tmp_path, monkeypatch):
+    source = tmp_path / "a.txt"
+    source.write_text("a")
+
+    def cross_device(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "replace", cross_device)
+    _move_file(source, tmp_path / "b.txt")
+
+    assert not source.exists()
+    assert (tmp_path / "b.txt").read_text() == "a"
+
+
+@pytest.fixture
+def move_folder(tmp_path, monkeypatch):
+    """Run moves inside a scratch folder, keeping the move log and undo file beside it."""
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    monkeypatch.chdir(folder)
+    monkeypatch.setattr(clean, "_LOG_FILE", tmp_path / "system_calls.log")
+    monkeypatch.setattr(clean, "_UNDO_FILE", tmp_path / "undo.json")
+    monkeypatch.setattr(clean, "_LEGACY_UNDO_FILE", tmp_path / "undo.db")
+    clean._LOG_FILE.touch()
+    return folder
+
+
+def test_execute_move_commands_moves_every_file_and_logs_in_order(move_folder):
+    names = [f"{index:02}.txt" for index in range(40)]
+    for name in names:
+        (move_folder / name).write_text(name)
+    # reversed, so the log order can only match by following the commands
+    commands = {
+        Path(name): Path("docs") / f"docs {index % 3}" / name for index, name in enumerate(names)
+    }
+    commands = dict(reversed(commands.items()))
+
+    execute_move_commands(commands)
+
+    for source, dest in commands.items():
+        assert not (move_folder / source).exists()
+        assert (move_folder / dest).read_text() == source.name
+    moves = [line for line in clean._LOG_FILE.read_text().splitlines() if line.startswith("mv ")]
+    assert moves == [
+        f"mv {move_folder / source} {move_folder / dest}" for source, dest in commands.items()
+    ]
+
+
+def test_execute_move_commands_writes_undo_file(move_folder):
+    (move_folder / "a.txt").touch()
+
+    execute_move_commands({Path("a.txt"): Path("docs/a.txt")})
+
+    assert load_undo_log() == {str(move_folder).lower(): {"a.txt": str(Path("docs/a.txt"))}}
+
+
+def test_execute_move_commands_fills_given_undo_log(move_folder):
+    (move_folder / "a.txt").touch()
+    undo_log = {"/other": {"b.txt": "docs/b.txt"}}
+
+    execute_move_commands({Path("a.txt"): Path("docs/a.txt")}, undo_log=undo_log)
+
+    assert undo_log == {
+        "/other": {"b.txt": "docs/b.txt"},
+        str(move_folder).lower(): {"a.txt": str(Path("docs/a.txt"))},
+    }
+    # the caller owns saving a log it passed in
+    assert not clean._UNDO_FILE.exists()
+
+
+def test_execute_move_commands_records_moves_around_a_failure(move_folder, monkeypatch):
+    names = ["a.txt", "b.txt", "c.txt"]
+    for name in names:
+        (move_folder / name).write_text(name)
+    commands = {Path(name): Path("docs") / name for name in names}
+
+    move_file = clean._move_file
+
+    def refuse_b(source, dest):
+        if source.name == "b.txt":
+            raise PermissionError(errno.EACCES, "Permission denied", str(source))
+        move_file(source, dest)
+
+    monkeypatch.setattr(clean, "_move_file", refuse_b)
+    execute_move_commands(commands)
+
+    assert (move_folder / "b.txt").exists()
+    log = clean._LOG_FILE.read_text()
+    for name in ["a.txt", "c.txt"]:
+        assert f"mv {move_folder / name} {move_folder / 'docs' / name}" in log
+    assert "b.txt" not in log
+
+    monkeypatch.setattr(clean, "_move_file", move_file)
+    clean.undo(target=move_folder, yes_all=True, dry_run=False)
+
+    assert sorted(os.listdir(move_folder)) == names
+
+
+def test_remove_empty_dirs(tmp_path):
+    for folder in ["a/b/c", "a/d", "e/f"]:
+        (tmp_path / folder).mkdir(parents=True)
+    (tmp_path / "e" / "keep.txt").touch()
+
+    remove_empty_dirs(tmp_path)
+
+    assert sorted(path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*")) == [
+        "e",
+        "e/keep.txt",
+    ]
+
+
+def test_remove_empty_dirs_keeps_target(tmp_path):
+    target = tmp_path / "target"
+    (target / "a" / "b").mkdir(parents=True)
+
+    remove_empty_dirs(target)
+
+    assert target.is_dir()
+    assert os.listdir(target) == []
+
+
+@pytest.mark.parametrize(
+    "choice, threshold",
+    [
+        ("y", 150_000_000),
+        ("200mb", 200_000_000),
+        ("200MBs", 200_000_000),
+        ("5 MB", 5_000_000),
+        ("1_500mb", 1_500_000_000),
+        ("1,000 mbs", 1_000_000_000),
+        ("500kb", 500_000),
+        ("2_000 KBs", 2_000_000),
+        ("200", 200_000_000),
+        ("1_000", 1_000_000_000),
+        ("1,000", 1_000_000_000),
+    ],
+)
+def test_parse_large_threshold(choice, threshold):
+    assert _parse_large_threshold(choice) == threshold
+
+
+@pytest.mark.parametrize("choice", ["n", "", "mb", "_5mb", ",5mb", "five mb", "5 gb", "5.5"])
+def test_parse_large_threshold_rejects_other_input(choice):
+    # nothing counts as large, so no file is isolated
+    assert _parse_large_threshold(choice) == 150_000_000_000_000_000
+
+
+def test_replace_file_leaves_no_temporary_file(tmp_path):
+    target = tmp_path / "clean.toml"
+    target.write_text("old")
+
+    _replace_file(target, "CROWDED_FOLDER = 36\n")
+
+    assert target.read_text() == "CROWDED_FOLDER = 36\n"
+    assert os.listdir(tmp_path) == ["clean.toml"]
+
+
+def test_undo_log_migrates_from_shelve(tmp_path, monkeypatch):
+    monkeypatch.setattr(clean, "_UNDO_FILE", tmp_path / "undo.json")
+    monkeypatch.setattr(clean, "_LEGACY_UNDO_FILE", tmp_path / "undo.db")
+
+    assert load_undo_log() == {}
+
+    with shelve.open(str(tmp_path / "undo.db")) as db:
+        db["/archive"] = {Path("a.txt"): Path("media/media 2023/a.txt")}
+    assert load_undo_log() == {"/archive": {"a.txt": str(Path("media/media 2023/a.txt"))}}
+
+    save_undo_log({"/other": {"b.py": "programming/b.py"}})
+    assert load_undo_log() == {"/other": {"b.py": "programming/b.py"}}
+
+
 # @strategies.composite
 # def file_name(draw):
 #     file_name = draw(strategies.from_regex(r"\A[^/\\:*\"<>|?]+\.[^/\\:*\"<>|?]+$"))
@@ -0,0 +1,33 @@
+import random
+
+import pytest
+import sympy
+
+from ..algebra.problems import PROBLEM_GENERATORS, _fast_latex
+
+
+@pytest.mark.parametrize("name", list(PROBLEM_GENERATORS))
+@pytest.mark.parametrize("freq_weight", [1000, 50, 1])
+def test_generators_return_tex_pairs(name, freq_weight):
+    random.seed(0)
+    problem, answer = PROBLEM_GENERATORS[name](freq_weight)
+    assert isinstance(problem, str) and problem
+    assert isinstance(answer, str) and answer
+
+
+def test_fast_latex_matches_sympy_for_polynomials():
+    random.seed(0)
+    variables = sympy.symbols("a b c x y z m n")
+    for _ in range(500):
+        var = random.choice(variables)
+        degree = random.randint(0, 6)
+        expr = sympy.sympify(
+            sum(random.choice([-9, -3, -1, 0, 1, 2, 12]) * var**k for k in range(degree + 1))
+        )
+        assert _fast_latex(expr) == sympy.latex(expr)
+
+
+def test_fast_latex_falls_back_to_sympy():
+    x, y = sympy.symbols("x y")
+    for expr in [x / 2 + 1, x * y + 1, sympy.sqrt(x) + 1, x**-1 + 2, sympy.Symbol("alpha") ** 2]:
+        assert _fast_latex(expr) == sympy.latex(expr)
@@ -3,6 +3,7 @@ from typing import Any
 
 import readchar
 import rich
+from rich.text import Text
 
 # _SAVE_CURSOR = "\033[s"
 # _RESTORE_CURSOR = "\033[u"
@@ -66,19 +67,24 @@ Add/remove approval with left/right.
 Press Enter to continue."""
     )
 
+    console = rich.get_console()
     print("\n" * (len(target)))
     while True:
         if long_contents:
             print("\033[2J")
         else:
             print((_MOVE_UP + _CLEAR_LINE) * (len(target) + 1))
+        # set membership keeps each redraw linear in the number of items
+        approved = set(approved_targets)
+        # render every row first so each redraw is written in one console call
+        rows = []
         for index, item in enumerate(target):
             if repr_func:
                 display = repr_func(item)
             else:
                 display = item
 
-            style = "[green]" if approved_targets.count(index+1) else "[red]"
+            style = "[green]" if index+1 in approved else "[red]"
             if maximum and maximum == 1:
                 style = "[white]"
             if index == cursor_index:
@@ -86,15 +92,18 @@ Press Enter to continue."""
 
 
             if not maximum or maximum > 1:
-                print(f'[{'x' if approved_targets.count(index+1) else ' '}]', end="")
+                checkbox = f'[{'x' if index+1 in approved else ' '}]'
                 prefix = f"{index+1:02}.) "
             else:
+                checkbox = ""
                 if index == cursor_index:
                     prefix = " >"
                 else:
                     prefix = "  "
 
-            rich.print(rf"{style}{prefix}{display}")
+            rows.append(Text(checkbox) + console.render_str(rf"{style}{prefix}{display}"))
+
+        console.print(Text("\n").join(rows))
 
         choice = readchar.readkey()
         match choice:
@@ -156,7 +165,8 @@ Press Enter to continue."""
                 rich.print("[red]Terminated.", end="")
                 exit(1)
 
-    return [elem for i, elem in enumerate(target) if approved_targets.count(i+1)]
+    approved = set(approved_targets)
+    return [elem for i, elem in enumerate(target) if i+1 in approved]
 
 def select(target: list[Any], preamble: bool=False, repr_func = None):
     """Select and return a user-approved element from target list."""
@@ -201,11 +211,14 @@ Press Enter to continue."""
     if preamble:
         rich.print("\n" + preamble)
 
+    console = rich.get_console()
     print("\n" * (len(target)))
     while True:
         print((_MOVE_UP + _CLEAR_LINE) * (len(target) + 1))
+        approved = set(approved_targets)
+        rows = []
         for index, item in enumerate(target):
-            style = "[green]" if approved_targets.count(index+1) else "[red]"
+            style = "[green]" if index+1 in approved else "[red]"
             if index == cursor_index:
                 style = "[yellow]"
 
@@ -214,8 +227,10 @@ Press Enter to continue."""
             else:
                 display = f"{item} [white] -> {style}{target[item]}"
 
-            print(f'[{'x' if approved_targets.count(index+1) else ' '}]', end="")
-            rich.print(rf" {style}{index+1:02}.) {display}")
+            checkbox = f'[{'x' if index+1 in approved else ' '}]'
+            rows.append(Text(checkbox) + console.render_str(rf" {style}{index+1:02}.) {display}"))
+
+        console.print(Text("\n").join(rows))
 
         choice = readchar.readkey()
         match choice:
@@ -279,7 +294,8 @@ Press Enter to continue."""
                 exit(1)
 
 
-    return {elem:target[elem] for i, elem in enumerate(target) if approved_targets.count(i+1)}
+    approved = set(approved_targets)
+    return {elem:target[elem] for i, elem in enumerate(target) if i+1 in approved}
 
 
 def linearize_complex_object(object:list|dict, depth:int = 0) -> tuple[Any, int, type]: